@@ -1,87 +1,148 @@
 import os
+import time
 from flask import Flask, jsonify
 from flask_cors import CORS
-from flask_migrate import Migrate
+from flask_migrate import Migrate, stamp
 from dotenv import load_dotenv
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from alembic.runtime.migration import MigrationContext
 # Import db and all models
-from models import db, Teacher, Subject, Section, Schedule
-
-# Load environment variables
-load_dotenv()
-
-# Initialize Flask app
-app = Flask(__name__)
-# Configure CORS with specific options
-CORS(
-    app,
-    origins=["*"],
-    methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization", "X-Requested-With"],
-    supports_credentials=True
-)
+from models import db
+from models.engine import engine_options, apply_sqlite_pragmas
+from werkzeug.serving import is_running_from_reloader
+from jobs import init_jobs, start_job_recovery
+from telemetry import init_request_metrics
+from cli import register_commands
 
 # Get the absolute path of the directory containing this script
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+MIGRATIONS_DIR = os.path.join(BASE_DIR, 'migrations')
 
-# Ensure the db directory exists
-db_path = os.getenv('DATABASE_URL').replace('sqlite:///', '')
-db_dir = os.path.dirname(db_path)
-os.makedirs(db_dir, exist_ok=True)
+# Initialize Flask-Migrate
+migrate = Migrate()
 
-# Configure database
-app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-# Print database path for debugging
-print(f"Database URL: {app.config['SQLALCHEMY_DATABASE_URI']}")
-print(f"Database File Path: {db_path}")
+def _schema_is_current():
+    """True when the database is stamped with the latest Alembic revision"""
+    config = Config(os.path.join(MIGRATIONS_DIR, 'alembic.ini'))
+    config.set_main_option('script_location', MIGRATIONS_DIR)
+    head = ScriptDirectory.from_config(config).get_current_head()
 
-# Initialize db with app
-db.init_app(app)
+    with db.engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision() == head
+
+
+def _init_schema(app):
+    """Create the schema on a fresh database; leave a current one untouched"""
+    with app.app_context():
+        if _schema_is_current():
+            return
+
+        if not db.inspect(db.engine).get_table_names():
+            # Fresh database: build it from the models and mark it as migrated
+            db.create_all()
+            stamp(directory=MIGRATIONS_DIR)
+            print('Created database schema; run "flask seed" to load the sample data')
+        else:
+            # Created before migrations were tracked: add missing tables only
+            db.create_all()
+            print('Database schema is behind the migrations; run "flask db upgrade"')
+
+
+def create_app(config=None):
+    """Application factory; never writes data beyond creating a missing schema"""
+    start_time = time.perf_counter()
+
+    # Load environment variables
+    load_dotenv()
+
+    # Initialize Flask app
+    app = Flask(__name__)
+    # Configure CORS with specific options
+    CORS(
+        app,
+        origins=["*"],
+        methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
+        allow_headers=["Content-Type", "Authorization", "X-Requested-With"],
+        supports_credentials=True
+    )
+
+    # Configure database
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv(
+        'DATABASE_URL', 'sqlite:///' + os.path.join(BASE_DIR, 'db', 'db.sqlite')
+    )
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    if config:
+        app.config.update(config)
+    # Pool sizing and SQLite connect args, configurable through the environment
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config['SQLALCHEMY_DATABASE_URI']))
+
+    # Ensure the db directory exists
+    database_url = app.config['SQLALCHEMY_DATABASE_URI']
+    if database_url.startswith('sqlite:///'):
+        db_path = database_url.replace('sqlite:///', '')
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+    # Print database path for debugging
+    print(f"Database URL: {database_url}")
+
+    # Initialize db with app
+    db.init_app(app)
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR)
+    with app.app_context():
+        # WAL, busy timeout, synchronous and mmap pragmas on every pooled connection
+        apply_sqlite_pragmas(db.engine)
+        # Request latency, status and per-request query counts for /metrics
+        init_request_metrics(app, db.engine)
+
+    # Maintenance commands (flask seed, flask check-query-plans)
+    register_commands(app)
+
+    _init_schema(app)
+
+    # Jobs table of the generation worker pool; unfinished jobs are only
+    # taken over by serving processes, through start_job_recovery()
+    init_jobs(app)
+
+    # Register routes blueprint
+    from routes.sections import sections_bp
+    app.register_blueprint(sections_bp, url_prefix='/sections')
+
+    # Add this line to import the schedules blueprint
+    from routes.schedules import schedules_bp
+    app.register_blueprint(schedules_bp, url_prefix='/schedules')
+
+    # Import and register subjects blueprint
+    from routes.subjects import subjects_bp
+    app.register_blueprint(subjects_bp, url_prefix='/subjects')
+
+    # Import and register teachers blueprint
+    from routes.teachers import teachers_bp
+    app.register_blueprint(teachers_bp, url_prefix='/teachers')
+
+    # Prometheus-style metrics for the load balancer's scraper
+    from routes.metrics import metrics_bp
+    app.register_blueprint(metrics_bp, url_prefix='/metrics')
+
+    # Global error handlers
+    @app.errorhandler(404)
+    def not_found(error):
+        return jsonify({'error': 'Resource not found'}), 404
+
+    @app.errorhandler(400)
+    def bad_request(error):
+        return jsonify({'error': 'Bad request'}), 400
+
+    print(f"App created in {(time.perf_counter() - start_time) * 1000:.0f} ms")
+    return app
 
-# Initialize Flask-Migrate
-migrate = Migrate(app, db)
-
-# Create database tables
-with app.app_context():
-    db.create_all()
-    
-    # Seed the database with initial data in the correct order
-    # First seed subjects since teachers now depend on them
-    Subject.seed(db.session)
-    # Then seed sections
-    Section.seed(db.session)
-    # Now seed teachers (which reference subjects)
-    Teacher.seed(db.session)
-    
-    # Seed the many-to-many relationships after all individual models are seeded
-    Subject.seed_section_subject(db.session)
-    
-# Register routes blueprint
-from routes.sections import sections_bp
-app.register_blueprint(sections_bp, url_prefix='/sections')
-
-# Add this line to import the schedules blueprint
-from routes.schedules import schedules_bp
-app.register_blueprint(schedules_bp, url_prefix='/schedules')
-
-# Import and register subjects blueprint
-from routes.subjects import subjects_bp
-app.register_blueprint(subjects_bp, url_prefix='/subjects')
-
-# Import and register teachers blueprint
-from routes.teachers import teachers_bp
-app.register_blueprint(teachers_bp, url_prefix='/teachers')
-
-# Global error handlers
-@app.errorhandler(404)
-def not_found(error):
-    return jsonify({'error': 'Resource not found'}), 404
-
-@app.errorhandler(400)
-def bad_request(error):
-    return jsonify({'error': 'Bad request'}), 400
 
 # Run the application
 if __name__ == '__main__':
-    app.run(host='127.0.0.1', port=8080, debug=True)
\ No newline at end of file
+    app = create_app()
+    # The debug reloader runs this block in a watcher process and again in
+    # the serving child; only the child takes over generation jobs
+    if is_running_from_reloader():
+        start_job_recovery()
+    app.run(host='127.0.0.1', port=8080, debug=True)
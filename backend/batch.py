@@ -0,0 +1,141 @@
+import os
+import sys
+import json
+import argparse
+import contextlib
+from dotenv import load_dotenv
+from scripts.solver import SCHEDULERS, solve
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+DEFAULT_DATABASE_URL = 'sqlite:///' + os.path.join(BASE_DIR, 'db', 'db.sqlite')
+
+
+def _problems_from_files(paths):
+    """Yield (name, problem) for every problem in the JSON files
+
+    A file holds one problem object or a list of them, in the format read by
+    ScheduleProblem.from_dict(). Problems are named by their "name" key, or
+    by the file name and position.
+    """
+    from scripts.schedule_problem import ScheduleProblem
+
+    for path in paths:
+        with open(path) as f:
+            data = json.load(f)
+        problems = data if isinstance(data, list) else [data]
+        for index, problem in enumerate(problems):
+            name = problem.get('name') or (path if len(problems) == 1 else f"{path}#{index}")
+            yield name, ScheduleProblem.from_dict(problem)
+
+
+def _database_session(database_url):
+    """Plain SQLAlchemy session on the database, without creating the Flask app"""
+    # Imported here so JSON-file runs never load SQLAlchemy or the models
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from models.engine import engine_options, apply_sqlite_pragmas
+
+    engine = create_engine(database_url, **engine_options(database_url))
+    apply_sqlite_pragmas(engine)
+    return Session(engine)
+
+
+def _run(name, problem, algorithm, args):
+    """Solve one problem with one algorithm and return its result record"""
+    record = {
+        'problem': name,
+        'algorithm': algorithm,
+        'seed': args.seed,
+        'workers': args.workers,
+        'time_limit': args.time_limit,
+    }
+    try:
+        # Solver progress goes to stderr so stdout carries only JSON lines
+        with contextlib.redirect_stdout(sys.stderr):
+            result = solve(problem, algorithm, seed=args.seed, workers=args.workers, time_limit=args.time_limit)
+    except Exception as e:
+        record.update(status='failed', error=str(e))
+        return record, None
+
+    record.update(
+        status='completed',
+        execution_time_seconds=round(result['execution_time'], 4),
+        evaluations=result['evaluations'],
+        metrics=result['metrics'],
+        phases=result['phases'],
+        counters=result['counters'],
+    )
+    if not args.no_schedules:
+        record['schedules'] = result['schedules']
+    return record, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python batch.py',
+        description='Run the schedulers without the web server and stream one JSON line per run'
+    )
+    parser.add_argument('algorithm', choices=sorted(SCHEDULERS) + ['all'])
+    parser.add_argument('--problem', nargs='+', metavar='FILE',
+                        help='JSON problem files; without them the problem is loaded from DATABASE_URL')
+    parser.add_argument('--database-url', help='Overrides DATABASE_URL')
+    parser.add_argument('--workers', type=int, help='MOGA islands / ACO ant workers (default: MOGA_ISLANDS / ACO_WORKERS)')
+    parser.add_argument('--seed', type=int, help='Seed for reproducible runs')
+    parser.add_argument('--time-limit', type=float, help='Stop each search after this many seconds')
+    parser.add_argument('--output', default='-', help='JSON lines file, "-" (default) for stdout')
+    parser.add_argument('--no-schedules', action='store_true', help='Leave the schedule entries out of the records')
+    parser.add_argument('--save', action='store_true',
+                        help='Database runs only: store the schedule of a single algorithm and commit')
+    parser.add_argument('--clear-existing', action='store_true', help='With --save, replace the stored schedules')
+    args = parser.parse_args(argv)
+
+    algorithms = list(SCHEDULERS) if args.algorithm == 'all' else [args.algorithm]
+    if args.save and (args.problem or len(algorithms) > 1):
+        parser.error('--save needs a single algorithm and the database as the problem source')
+    if args.clear_existing and not args.save:
+        parser.error('--clear-existing only applies with --save')
+
+    session = None
+    if args.problem:
+        problems = _problems_from_files(args.problem)
+    else:
+        load_dotenv()
+        database_url = args.database_url or os.getenv('DATABASE_URL', DEFAULT_DATABASE_URL)
+        from scripts.orm import load_problem
+        from scripts.persistence import save_schedules
+        from models import Teacher, Subject, Section, Schedule
+        session = _database_session(database_url)
+        problems = [(database_url, load_problem(session, Section, Subject, Teacher))]
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    failed = False
+    try:
+        for name, problem in problems:
+            for algorithm in algorithms:
+                record, result = _run(name, problem, algorithm, args)
+                failed = failed or record['status'] == 'failed'
+
+                if args.save and result:
+                    try:
+                        record['saved'] = save_schedules(
+                            session, Schedule, result['schedules'], clear_existing=args.clear_existing
+                        )
+                        session.commit()
+                    except Exception as e:
+                        session.rollback()
+                        record.update(status='failed', error=f"Saving failed: {e.__cause__ or e}")
+                        failed = True
+
+                output.write(json.dumps(record) + '\n')
+                output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if session is not None:
+            session.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
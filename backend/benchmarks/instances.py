@@ -0,0 +1,64 @@
+import math
+import random
+from scripts.timetable import DAYS, TIME_SLOTS
+
+# Section counts of the default scaling curve
+DEFAULT_SIZES = [5, 20, 50, 100, 200, 500]
+
+# Teacher capacity relative to the classes that must be taught: 1.0 gives
+# just enough teaching slots, below 1.0 conflicts are unavoidable (except on
+# small instances, see generate_instance)
+DEFAULT_TEACHER_RATIOS = [0.8, 1.0, 1.5]
+
+DEFAULT_NUM_SUBJECTS = 8
+
+
+def generate_instance(num_sections, teacher_ratio=1.0, num_subjects=DEFAULT_NUM_SUBJECTS, seed=0):
+    """Build a reproducible synthetic school as plain dicts
+
+    Every section needs every subject, as in the seeded database. The number
+    of teachers is teacher_ratio times the teachers needed to cover all
+    classes, but at least one per subject. Teachers are dealt to subjects
+    round by round, so every subject gets a specialist before any subject
+    gets a second one, and the remainder goes to random subjects. Ids are
+    shuffled and sparse so nothing relies on 1..n ids.
+
+    The one-per-subject floor adds capacity below num_slots / teacher_ratio
+    sections (50 at ratio 0.8 with the default timetable), so there a ratio
+    below 1.0 does not make conflicts unavoidable.
+    """
+    rng = random.Random(f"{seed}:{num_sections}:{teacher_ratio}:{num_subjects}")
+    num_slots = len(DAYS) * len(TIME_SLOTS)
+
+    subject_ids = rng.sample(range(1, num_subjects * 10 + 1), num_subjects)
+    section_ids = rng.sample(range(1, num_sections * 10 + 1), num_sections)
+
+    # Teachers per subject: an even share of the capacity, at least one each.
+    # Dealt in rounds so truncating to num_teachers only trims the last round
+    per_subject = max(1, math.ceil(teacher_ratio * num_sections / num_slots))
+    num_teachers = max(num_subjects, math.ceil(teacher_ratio * num_sections * num_subjects / num_slots))
+    teacher_subjects = [subject_id for _ in range(per_subject) for subject_id in subject_ids]
+    teacher_subjects = teacher_subjects[:num_teachers]
+    teacher_subjects += [rng.choice(subject_ids) for _ in range(num_teachers - len(teacher_subjects))]
+    rng.shuffle(teacher_subjects)
+    teacher_ids = rng.sample(range(1, num_teachers * 10 + 1), num_teachers)
+
+    return {
+        'name': f"sections-{num_sections}-ratio-{teacher_ratio}-seed-{seed}",
+        'seed': seed,
+        'teacher_ratio': teacher_ratio,
+        'days': list(DAYS),
+        'time_slots': list(TIME_SLOTS),
+        'subjects': [
+            {'id': subject_id, 'name': f"Subject {i + 1}", 'code': f"SUB{i + 1}"}
+            for i, subject_id in enumerate(subject_ids)
+        ],
+        'sections': [
+            {'id': section_id, 'name': f"Section {i + 1}"}
+            for i, section_id in enumerate(section_ids)
+        ],
+        'teachers': [
+            {'id': teacher_id, 'name': f"Teacher {i + 1}", 'subject_id': subject_id}
+            for i, (teacher_id, subject_id) in enumerate(zip(teacher_ids, teacher_subjects))
+        ],
+    }
@@ -0,0 +1,128 @@
+import io
+import sys
+import json
+import argparse
+import platform
+import tracemalloc
+import contextlib
+from datetime import datetime
+from scripts.schedule_problem import ScheduleProblem
+from scripts.solver import SCHEDULERS, solve
+from .instances import generate_instance, DEFAULT_SIZES, DEFAULT_TEACHER_RATIOS, DEFAULT_NUM_SUBJECTS
+
+
+def _parse_overrides(pairs):
+    """Turn ["GENERATIONS=20", ...] into {'GENERATIONS': 20, ...}"""
+    overrides = {}
+    for pair in pairs:
+        name, _, value = pair.partition('=')
+        try:
+            overrides[name] = json.loads(value)
+        except ValueError:
+            overrides[name] = value
+    return overrides
+
+
+def run_benchmark(algorithm, instance, seed=0, overrides=None, trace_memory=True):
+    """Run one scheduler on an instance and return a result record
+
+    The instance goes straight into a ScheduleProblem, so no database is
+    involved. Building the scheduler and the search are timed; solver
+    output is discarded. Overrides set scheduler constants such as
+    GENERATIONS on the algorithms that have them.
+    """
+    problem = ScheduleProblem.from_dict(instance)
+
+    if trace_memory:
+        tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = solve(problem, algorithm, seed=seed, constants=overrides)
+    peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+
+    wall_time = result['execution_time']
+    evaluations = result['evaluations']
+    # Algorithms report different metrics; score every best solution the same way
+    metrics = problem.evaluate(result['solution'])
+
+    return {
+        'algorithm': algorithm,
+        'instance': instance['name'],
+        'sections': problem.num_sections,
+        'subjects': problem.num_subjects,
+        'teachers': problem.num_teachers,
+        'teacher_ratio': instance['teacher_ratio'],
+        'genes': problem.num_genes,
+        'seed': seed,
+        'overrides': result['constants'],
+        'wall_time_seconds': round(wall_time, 4),
+        'peak_memory_bytes': peak_memory,
+        'evaluations': evaluations,
+        'evaluations_per_second': round(evaluations / wall_time, 1) if wall_time > 0 else None,
+        'phases': result['phases'],
+        'counters': result['counters'],
+        'teacher_conflicts': metrics['teacher_conflicts'],
+        'section_conflicts': metrics['section_conflicts'],
+        'load_variance': metrics['load_variance'],
+        'suitability': metrics['suitability'],
+    }
+
+
+def _environment():
+    """Interpreter and library versions stored with every record"""
+    import numpy
+    return {
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'platform': platform.platform(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.runner',
+        description='Time the schedulers on seeded synthetic instances and write JSON lines'
+    )
+    parser.add_argument('--algorithms', nargs='+', choices=sorted(SCHEDULERS), default=list(SCHEDULERS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES, help='Section counts')
+    parser.add_argument('--teacher-ratios', nargs='+', type=float, default=DEFAULT_TEACHER_RATIOS,
+                        help='Teacher capacity relative to the classes to teach')
+    parser.add_argument('--subjects', type=int, default=DEFAULT_NUM_SUBJECTS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per configuration, seeds seed..seed+repeat-1')
+    parser.add_argument('--set', dest='overrides', action='append', default=[], metavar='NAME=VALUE',
+                        help='Override a scheduler constant, e.g. --set GENERATIONS=20')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Skip tracemalloc; it slows pure-Python solvers noticeably')
+    parser.add_argument('--output', default='benchmark_results.jsonl', help='JSON lines file, "-" for stdout')
+    args = parser.parse_args(argv)
+
+    overrides = _parse_overrides(args.overrides)
+    environment = _environment()
+    started_at = datetime.now().isoformat(timespec='seconds')
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+
+    try:
+        for size in args.sizes:
+            for ratio in args.teacher_ratios:
+                for repeat in range(args.repeat):
+                    seed = args.seed + repeat
+                    instance = generate_instance(size, ratio, args.subjects, seed)
+                    for algorithm in args.algorithms:
+                        record = run_benchmark(algorithm, instance, seed, overrides, not args.no_memory)
+                        record.update(environment, started_at=started_at)
+                        output.write(json.dumps(record) + '\n')
+                        output.flush()
+                        print(f"{algorithm:>14} {size:>4} sections ratio {ratio:<4} seed {seed}: "
+                              f"{record['wall_time_seconds']:.2f}s, "
+                              f"{record['evaluations_per_second'] or 0:.0f} evals/s, "
+                              f"conflicts {record['teacher_conflicts']}/{record['section_conflicts']}",
+                              file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import subprocess
+import click
+from sqlalchemy import create_engine, insert, text
+from models import db, Teacher, Subject, Section, Schedule, DataVersion
+from models.engine import engine_options, apply_sqlite_pragmas, SQLITE_JOURNAL_MODE
+
+# Route queries that must be served by an index: (route, query builder, index).
+# Listings are ordered by id, so each filter must walk an index ending in id
+INDEXED_QUERIES = [
+    ('GET /schedules/teacher/<id>',
+     lambda: Schedule.listing_query(Schedule.teacher_id == 1),
+     'ix_schedules_teacher_page'),
+    ('GET /schedules/section/<id>',
+     lambda: Schedule.listing_query(Schedule.section_id == 1),
+     'ix_schedules_section_page'),
+] + [
+    (f'GET /schedules/?{column}=&cursor=',
+     lambda column=column: Schedule.listing_query(getattr(Schedule, column) == 1, Schedule.id > 1).limit(501),
+     index_name)
+    for column, index_name in [
+        ('teacher_id', 'ix_schedules_teacher_page'),
+        ('section_id', 'ix_schedules_section_page'),
+        ('day', 'ix_schedules_day_page'),
+        ('time_slot', 'ix_schedules_time_slot_page'),
+        ('subject_id', 'ix_schedules_subject_page'),
+    ]
+]
+
+# Plan step that means every page sorts the whole filtered set
+SQLITE_SORT_STEP = 'USE TEMP B-TREE FOR ORDER BY'
+
+
+# Modules a web worker must not import until a generation job needs them
+SOLVER_ONLY_MODULES = ['numpy', 'scripts.schedule_problem', 'scripts.moga_algo',
+                       'scripts.hill_climbing', 'scripts.simple_genetic', 'scripts.ant_colony']
+WEB_MODULES = ['app', 'routes.schedules', 'routes.sections', 'routes.subjects', 'routes.teachers']
+IMPORT_BUDGET_MS = int(os.getenv('IMPORT_BUDGET_MS', '1500'))
+
+# The solver core must run in workers, benchmarks and notebooks without the web stack
+SOLVER_CORE_MODULES = ['scripts.solver', 'scripts.moga_algo', 'scripts.hill_climbing',
+                       'scripts.simple_genetic', 'scripts.ant_colony']
+WEB_STACK_MODULES = ['flask', 'sqlalchemy', 'models']
+
+# Slowest read check-concurrency accepts while a generation write is open
+MAX_READ_LATENCY_MS = 250
+
+
+def _import_times(modules):
+    """Import modules in a fresh interpreter and return {module: cumulative microseconds}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {', '.join(modules)}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+def _query_plan(query):
+    """Return the database's query plan for an ORM query as one string"""
+    sql = str(query.statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    dialect = db.engine.dialect.name
+
+    with db.engine.connect() as conn:
+        if dialect == 'sqlite':
+            rows = conn.execute(text(f'EXPLAIN QUERY PLAN {sql}'))
+            return '\n'.join(row[-1] for row in rows)
+        if dialect == 'postgresql':
+            # Tiny tables are always seq-scanned; ask whether the index is usable
+            conn.execute(text('SET enable_seqscan = off'))
+        rows = conn.execute(text(f'EXPLAIN {sql}'))
+        return '\n'.join(str(row[0]) for row in rows)
+
+
+def _reads_during_write(database_url, rows):
+    """Commit a generation-sized insert in one thread while another keeps reading
+
+    Returns (write_seconds, read_latencies, errors) for the reads that ran
+    while the write transaction was open.
+    """
+    engine = create_engine(database_url, **engine_options(database_url))
+    apply_sqlite_pragmas(engine)
+    db.metadata.create_all(engine)
+
+    entries = [
+        {'day': 'Monday', 'time_slot': '7:30-8:30', 'teacher_id': 1, 'section_id': i, 'subject_id': 1}
+        for i in range(rows)
+    ]
+    writing = threading.Event()
+    timing = {}
+
+    def write():
+        with engine.begin() as conn:
+            writing.set()
+            start = time.perf_counter()
+            conn.execute(insert(Schedule), entries)
+        timing['write'] = time.perf_counter() - start
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    writing.wait()
+
+    latencies, errors = [], []
+    while writer.is_alive():
+        start = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                conn.execute(text('SELECT COUNT(*) FROM schedules')).scalar()
+            latencies.append(time.perf_counter() - start)
+        except Exception as e:
+            errors.append(str(e.__cause__ or e))
+    writer.join()
+    engine.dispose()
+    return timing['write'], latencies, errors
+
+
+def register_commands(app):
+    """Attach the backend's maintenance commands to the flask CLI"""
+
+    @app.cli.command('seed')
+    def seed():
+        """Replace teachers, subjects and sections with the sample data"""
+        # Seed the database with initial data in the correct order
+        # First seed subjects since teachers now depend on them
+        Subject.seed(db.session)
+        # Then seed sections
+        Section.seed(db.session)
+        # Now seed teachers (which reference subjects)
+        Teacher.seed(db.session)
+
+        # Seed the many-to-many relationships after all individual models are seeded
+        Subject.seed_section_subject(db.session)
+
+        # Seeding rewrote the tables, so ETags handed out before are stale
+        DataVersion.bump(db.session)
+        db.session.commit()
+
+    @app.cli.command('check-imports')
+    def check_imports():
+        """Fail if web modules load solver code, the solver core loads Flask/SQLAlchemy, or imports are slow"""
+        times = _import_times(WEB_MODULES)
+        total_ms = sum(times.get(module, 0) for module in WEB_MODULES) / 1000
+
+        leaked = [module for module in SOLVER_ONLY_MODULES if module in times]
+        for module in leaked:
+            click.echo(f"FAIL {module} is imported by the web process")
+
+        core_times = _import_times(SOLVER_CORE_MODULES)
+        web_in_core = [module for module in WEB_STACK_MODULES if module in core_times]
+        for module in web_in_core:
+            click.echo(f"FAIL {module} is imported by the solver core")
+        leaked += web_in_core
+
+        slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)
+        click.echo('Slowest top-level imports:')
+        for name, cumulative in [item for item in slowest if '.' not in item[0]][:8]:
+            click.echo(f"     {cumulative / 1000:8.1f} ms  {name}")
+
+        click.echo(f"{'OK  ' if total_ms <= IMPORT_BUDGET_MS else 'FAIL'} web modules imported in "
+                   f"{total_ms:.0f} ms (budget {IMPORT_BUDGET_MS} ms)")
+        if leaked or total_ms > IMPORT_BUDGET_MS:
+            sys.exit(1)
+
+    @app.cli.command('check-concurrency')
+    @click.option('--rows', default=200000, help='Rows inserted by the simulated generation write')
+    @click.option('--max-latency-ms', default=MAX_READ_LATENCY_MS, help='Slowest acceptable read while the write is open')
+    def check_concurrency(rows, max_latency_ms):
+        """Show reads proceeding while a large generation write commits (temporary SQLite file)"""
+        directory = tempfile.mkdtemp()
+        try:
+            write_seconds, latencies, errors = _reads_during_write(
+                f"sqlite:///{os.path.join(directory, 'concurrency.sqlite')}", rows
+            )
+        finally:
+            shutil.rmtree(directory)
+
+        click.echo(f"journal_mode={SQLITE_JOURNAL_MODE}: {rows} rows written in {write_seconds:.2f}s")
+        if latencies:
+            click.echo(f"     {len(latencies)} reads during the write, "
+                       f"max latency {max(latencies) * 1000:.1f} ms")
+        for error in sorted(set(errors)):
+            click.echo(f"FAIL {errors.count(error)} reads failed: {error}")
+
+        blocked = bool(latencies) and max(latencies) * 1000 > max_latency_ms
+        if blocked:
+            click.echo(f"FAIL reads waited longer than {max_latency_ms} ms for the writer")
+        if errors or blocked or not latencies:
+            sys.exit(1)
+        click.echo('OK   readers were not blocked by the writer')
+
+    @app.cli.command('check-query-plans')
+    def check_query_plans():
+        """Fail unless the schedule listings use their indexes without sorting"""
+        failed = False
+        for route, build_query, index_name in INDEXED_QUERIES:
+            plan = _query_plan(build_query())
+            ok = index_name in plan and SQLITE_SORT_STEP not in plan
+            failed = failed or not ok
+            click.echo(f"{'OK  ' if ok else 'FAIL'} {route}: expected {index_name}, no sort")
+            for line in plan.splitlines():
+                click.echo(f"     {line}")
+
+        if failed:
+            click.echo('Run "flask db upgrade" to add the missing schedule indexes.')
+            sys.exit(1)
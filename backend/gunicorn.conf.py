@@ -0,0 +1,15 @@
+# Read by gunicorn from the working directory: gunicorn "app:create_app()"
+import os
+
+# GET /schedules/jobs/<id>/events holds a thread for the whole generation
+# job, so each worker serves requests from a thread pool instead of the
+# default single-threaded sync worker. Keep SSE_MAX_STREAMS below threads
+# so open streams always leave threads for ordinary requests
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+
+
+def post_worker_init(worker):
+    """Renew this worker's job leases and take over expired generation jobs"""
+    from jobs import start_job_recovery
+    start_job_recovery()
@@ -0,0 +1,3 @@
+from .runner import ALGORITHMS, init_jobs, submit_job, run_job, recover_expired_jobs, start_job_recovery
+
+__all__ = ['ALGORITHMS', 'init_jobs', 'submit_job', 'run_job', 'recover_expired_jobs', 'start_job_recovery']
@@ -0,0 +1,376 @@
+import os
+import json
+import time
+import uuid
+import socket
+import threading
+import traceback
+import multiprocessing
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, or_, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from models import db, Teacher, Section, Subject, Schedule, GenerationJob
+from models.engine import engine_options, apply_sqlite_pragmas
+from scripts.progress import ProgressReporter
+from scripts.timing import PhaseTimer
+from scripts.registry import SCHEDULERS, get_solver
+from telemetry import GENERATIONS_IN_FLIGHT, record_generation
+
+# Algorithms accepted by submit_job; solvers are imported inside the worker
+ALGORITHMS = SCHEDULERS
+
+# Process pool shared by every job submitted from this web process
+_executor = None
+_executor_lock = threading.Lock()
+_database_url = None
+# Engine for job status updates made outside requests (recovery, crashed workers)
+_status_engine = None
+_recovery_thread = None
+
+# Job leases: holders renew every JOB_HEARTBEAT_SECONDS, and a queued or
+# running job whose lease is older than JOB_LEASE_SECONDS is taken over
+JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '120'))
+JOB_HEARTBEAT_SECONDS = int(os.getenv('JOB_HEARTBEAT_SECONDS', '15'))
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _owner():
+    """Lease holder id of this process"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _get_executor():
+    """Create the worker pool on first use so importing the app never starts workers
+
+    Workers are spawned rather than forked: a forked child would inherit
+    the web process's pooled database connections, the recovery thread's
+    locks and gunicorn's signal handlers.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=int(os.getenv('GENERATION_WORKERS', '1')),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _executor
+
+
+def _replace_broken_executor(broken):
+    """Drop a pool whose worker died so the next submit starts a new one"""
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            print("Generation worker pool is broken; starting a new one")
+            _executor = None
+    broken.shutdown(wait=False)
+
+
+def _submit(job_id, algorithm):
+    """Hand a job to the worker pool and record its outcome when the worker is done"""
+    executor = _get_executor()
+    try:
+        future = executor.submit(run_job, _database_url, job_id)
+    except BrokenProcessPool:
+        # A worker died (out of memory, killed) and took the whole pool with it
+        _replace_broken_executor(executor)
+        future = _get_executor().submit(run_job, _database_url, job_id)
+
+    GENERATIONS_IN_FLIGHT.labels(algorithm).inc()
+    future.add_done_callback(lambda future: _job_done(job_id, algorithm, future))
+
+
+def _job_done(job_id, algorithm, future):
+    """Update the generation metrics from a finished worker (runs in this process)"""
+    GENERATIONS_IN_FLIGHT.labels(algorithm).dec()
+    try:
+        summary = future.result()
+    except BrokenProcessPool as e:
+        summary = _recover_crashed_job(job_id, algorithm, e)
+    except Exception:
+        # The pool was shut down with the job still waiting
+        summary = {'status': 'crashed'}
+    if summary:
+        record_generation(algorithm, summary)
+
+
+def _get_status_engine():
+    global _status_engine
+    if _status_engine is None:
+        _status_engine = create_engine(_database_url, **engine_options(_database_url))
+        apply_sqlite_pragmas(_status_engine)
+    return _status_engine
+
+
+def _recover_crashed_job(job_id, algorithm, error):
+    """Settle a job whose worker pool broke
+
+    Every job in the pool fails with BrokenProcessPool when one worker dies.
+    A job that was running never committed its schedules, so it is marked
+    failed; a job that was still queued did nothing yet and goes to a new
+    pool. Returns the metrics summary, or None for a resubmitted job.
+    """
+    with _get_status_engine().begin() as conn:
+        failed = conn.execute(
+            update(GenerationJob)
+            .where(GenerationJob.id == job_id, GenerationJob.status == 'running')
+            .values(status='failed', error=f"Generation worker process died: {error}", finished_at=_utcnow())
+        ).rowcount
+        status = conn.execute(select(GenerationJob.status).where(GenerationJob.id == job_id)).scalar()
+
+    if failed:
+        print(f"Generation job {job_id} ({algorithm}) failed: its worker process died")
+        return {'status': 'crashed'}
+    if status == 'queued':
+        print(f"Resubmitting generation job {job_id} ({algorithm}) to a new worker pool")
+        _submit(job_id, algorithm)
+    return None
+
+
+def init_jobs(app):
+    """Remember the database URL of the jobs table
+
+    Only configures this process. Taking over unfinished jobs is left to
+    start_job_recovery(), which the serving process calls at startup, so
+    CLI commands and tests that build the app never run anyone's jobs.
+    """
+    global _database_url
+    _database_url = app.config['SQLALCHEMY_DATABASE_URI']
+
+
+def _expired_lease(cutoff):
+    """Criteria of queued or running jobs whose holder stopped renewing the lease"""
+    return (
+        GenerationJob.status.in_(['queued', 'running']),
+        or_(GenerationJob.heartbeat_at.is_(None), GenerationJob.heartbeat_at < cutoff),
+    )
+
+
+def recover_expired_jobs():
+    """Take over queued or running jobs whose lease expired and submit them
+
+    A running job whose holder died never committed its schedules (they are
+    written in the same transaction as the result), so it is run again.
+    Each takeover is a conditional UPDATE, so servers sweeping at the same
+    time never take the same job. Returns the ids taken over.
+    """
+    owner = _owner()
+    expired = _expired_lease(_utcnow() - timedelta(seconds=JOB_LEASE_SECONDS))
+    taken = []
+    with _get_status_engine().begin() as conn:
+        candidates = conn.execute(select(GenerationJob.id, GenerationJob.algorithm).where(*expired)).all()
+        for job_id, algorithm in candidates:
+            if conn.execute(
+                update(GenerationJob)
+                .where(GenerationJob.id == job_id, *expired)
+                .values(status='queued', started_at=None, owner=owner, heartbeat_at=_utcnow())
+            ).rowcount:
+                taken.append((job_id, algorithm))
+
+    for job_id, algorithm in taken:
+        print(f"Requeueing generation job {job_id} ({algorithm}): its lease expired")
+        _submit(job_id, algorithm)
+    return [job_id for job_id, _ in taken]
+
+
+def _renew_queued_leases():
+    """Renew the leases of the jobs this process queued and no worker has started"""
+    with _get_status_engine().begin() as conn:
+        conn.execute(
+            update(GenerationJob)
+            .where(GenerationJob.owner == _owner(), GenerationJob.status == 'queued')
+            .values(heartbeat_at=_utcnow())
+        )
+
+
+def _recovery_loop():
+    while True:
+        try:
+            _renew_queued_leases()
+            recover_expired_jobs()
+        except OperationalError as e:
+            print(f"Skipped generation job recovery: {e.orig}")
+        time.sleep(JOB_HEARTBEAT_SECONDS)
+
+
+def start_job_recovery():
+    """Keep this serving process's leases alive and take over expired jobs
+
+    Runs a sweep every JOB_HEARTBEAT_SECONDS in a background thread. Called
+    once per serving process (python app.py, the gunicorn post_worker_init
+    hook), after create_app().
+    """
+    global _recovery_thread
+    if _recovery_thread is None:
+        _recovery_thread = threading.Thread(target=_recovery_loop, name='generation-job-recovery', daemon=True)
+        _recovery_thread.start()
+
+
+def submit_job(algorithm, clear_existing=False):
+    """Record a queued job and hand it to the worker pool"""
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+
+    job = GenerationJob(
+        id=uuid.uuid4().hex,
+        algorithm=algorithm,
+        status='queued',
+        clear_existing=clear_existing,
+        created_at=_utcnow(),
+        owner=_owner(),
+        heartbeat_at=_utcnow()
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    try:
+        _submit(job.id, algorithm)
+    except Exception as e:
+        # Never leave a queued row that no worker will pick up
+        job.status = 'failed'
+        job.error = f"Could not start a generation worker: {e}"
+        job.finished_at = _utcnow()
+        db.session.commit()
+        raise
+    return job
+
+
+def _progress_writer(engine, job_id):
+    """Persist progress snapshots in their own short transactions"""
+    def write(snapshot):
+        # The solver session holds the uncommitted schedules, so progress goes
+        # through a separate connection that the event stream can see immediately
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    update(GenerationJob)
+                    .where(GenerationJob.id == job_id)
+                    .values(progress_json=json.dumps(snapshot))
+                )
+        except OperationalError as e:
+            # SQLite locks the whole file while a clear_existing job holds its
+            # delete; progress is best-effort, so skip the snapshot instead of waiting
+            print(f"Skipped progress update for job {job_id}: {e.orig}")
+    return write
+
+
+def _progress_engine(database_url):
+    """Engine for progress and lease writes that fails fast instead of waiting on a lock"""
+    if database_url.startswith('sqlite'):
+        # Shared by the solver thread and the lease renewer thread
+        engine = create_engine(database_url, connect_args={'timeout': 0, 'check_same_thread': False})
+        apply_sqlite_pragmas(engine, busy_timeout_ms=None)
+        return engine
+    return create_engine(database_url)
+
+
+def _renew_lease(engine, job_id, owner, stop):
+    """Renew a running job's lease until stop is set (thread in the worker)"""
+    while not stop.wait(JOB_HEARTBEAT_SECONDS):
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    update(GenerationJob)
+                    .where(GenerationJob.id == job_id, GenerationJob.owner == owner)
+                    .values(heartbeat_at=_utcnow())
+                )
+        except OperationalError as e:
+            # A skipped renewal is harmless while a later one lands within the lease
+            print(f"Skipped lease renewal for job {job_id}: {e.orig}")
+
+
+def run_job(database_url, job_id):
+    """Run one generation job in a worker process
+
+    Returns a small summary for the web process's metrics (status, solver
+    seconds and evaluations), or None if another worker claimed the job or
+    took it over while it ran.
+    """
+    engine = create_engine(database_url, **engine_options(database_url))
+    apply_sqlite_pragmas(engine)
+    progress_engine = _progress_engine(database_url)
+    owner = _owner()
+    stop_renewing = threading.Event()
+    renewer = None
+    try:
+        with Session(engine) as session:
+            # Claim the job atomically so a requeued job never runs twice
+            claimed = session.execute(
+                update(GenerationJob)
+                .where(GenerationJob.id == job_id, GenerationJob.status == 'queued')
+                .values(status='running', started_at=_utcnow(), owner=owner, heartbeat_at=_utcnow())
+            ).rowcount
+            session.commit()
+            if not claimed:
+                return None
+
+            renewer = threading.Thread(
+                target=_renew_lease, args=(progress_engine, job_id, owner, stop_renewing), daemon=True
+            )
+            renewer.start()
+
+            job = session.get(GenerationJob, job_id)
+            try:
+                create_schedule = get_solver(job.algorithm)
+                progress = ProgressReporter(_progress_writer(progress_engine, job_id), job.algorithm)
+                timer = PhaseTimer()
+                count, metrics, execution_time = create_schedule(
+                    session, Section, Subject, Teacher, Schedule,
+                    progress=progress, clear_existing=job.clear_existing, timer=timer
+                )
+
+                # Schedules and the job result are committed together, and only
+                # while this worker still holds the lease: a job taken over by
+                # another server after its lease expired must not be saved twice
+                completed = session.execute(
+                    update(GenerationJob)
+                    .where(GenerationJob.id == job_id, GenerationJob.owner == owner,
+                           GenerationJob.status == 'running')
+                    .values(status='completed', count=count, metrics_json=json.dumps(metrics),
+                            execution_time=execution_time, finished_at=_utcnow())
+                ).rowcount
+                if not completed:
+                    session.rollback()
+                    print(f"Generation job {job_id} was taken over after its lease expired; discarding this run")
+                    return None
+                session.commit()
+                timer.lap('commit')
+                print(f"Generation job {job_id} ({job.algorithm}) phases: {timer.summary()}")
+
+                # The commit time is only known now; add it to the stored metrics.
+                # The schedules are already committed, so this update is best-effort
+                try:
+                    metrics['phases'] = timer.phase_seconds()
+                    job.metrics = metrics
+                    session.commit()
+                except OperationalError as e:
+                    session.rollback()
+                    print(f"Skipped commit timing for job {job_id}: {e.orig}")
+
+                return {
+                    'status': 'completed',
+                    'solver_seconds': sum(timer.phases.get(phase, 0.0) for phase in ('init', 'search', 'evaluate')),
+                    'evaluations': timer.counters.get('evaluations', 0),
+                }
+            except Exception as e:
+                session.rollback()
+                print(f"Generation job {job_id} failed: {e}\n{traceback.format_exc()}")
+                session.execute(
+                    update(GenerationJob)
+                    .where(GenerationJob.id == job_id, GenerationJob.owner == owner)
+                    .values(status='failed', error=str(e), finished_at=_utcnow())
+                )
+                session.commit()
+                return {'status': 'failed'}
+    finally:
+        stop_renewing.set()
+        if renewer is not None:
+            renewer.join()
+        progress_engine.dispose()
+        engine.dispose()
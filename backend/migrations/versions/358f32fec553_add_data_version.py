@@ -0,0 +1,33 @@
+"""add data_version
+
+Revision ID: 358f32fec553
+Revises: e83ef22776f9
+Create Date: 2026-10-18 12:36:51.207443
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '358f32fec553'
+down_revision = 'e83ef22776f9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The app may already have created the table through db.create_all()
+    if sa.inspect(op.get_bind()).has_table('data_version'):
+        return
+
+    data_version = op.create_table('data_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(data_version, [{'id': 1, 'version': 1}])
+
+
+def downgrade():
+    op.drop_table('data_version')
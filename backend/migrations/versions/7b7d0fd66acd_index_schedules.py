@@ -0,0 +1,48 @@
+"""index schedules by teacher and section, unique entries
+
+Revision ID: 7b7d0fd66acd
+Revises: e7e966b2ab66
+Create Date: 2026-10-18 09:20:47.664310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b7d0fd66acd'
+down_revision = 'e7e966b2ab66'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    indexes = {index['name'] for index in inspector.get_indexes('schedules')}
+    constraints = {constraint['name'] for constraint in inspector.get_unique_constraints('schedules')}
+
+    if 'uq_schedules_entry' not in constraints:
+        # Keep the oldest copy of any duplicated entry so the constraint can be added
+        op.execute(
+            "DELETE FROM schedules WHERE id NOT IN ("
+            "SELECT MIN(id) FROM schedules "
+            "GROUP BY day, time_slot, teacher_id, section_id, subject_id)"
+        )
+        with op.batch_alter_table('schedules', schema=None) as batch_op:
+            batch_op.create_unique_constraint(
+                'uq_schedules_entry', ['day', 'time_slot', 'teacher_id', 'section_id', 'subject_id']
+            )
+
+    # Ending in id lets a filtered keyset page walk the index without sorting
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        if 'ix_schedules_teacher_page' not in indexes:
+            batch_op.create_index('ix_schedules_teacher_page', ['teacher_id', 'id'], unique=False)
+        if 'ix_schedules_section_page' not in indexes:
+            batch_op.create_index('ix_schedules_section_page', ['section_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.drop_index('ix_schedules_section_page')
+        batch_op.drop_index('ix_schedules_teacher_page')
+        batch_op.drop_constraint('uq_schedules_entry', type_='unique')
@@ -0,0 +1,74 @@
+"""initial schema
+
+Revision ID: c347b1c65b7f
+Revises: 
+Create Date: 2026-10-18 09:12:40.118254
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c347b1c65b7f'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by db.create_all() before migrations were tracked
+    # already have these tables, so only create the missing ones
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'subjects' not in existing:
+        op.create_table('subjects',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('code', sa.String(), nullable=True),
+            sa.Column('description', sa.String(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+    if 'sections' not in existing:
+        op.create_table('sections',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+    if 'section_subject' not in existing:
+        op.create_table('section_subject',
+            sa.Column('section_id', sa.Integer(), nullable=False),
+            sa.Column('subject_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['section_id'], ['sections.id'], ),
+            sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], ),
+            sa.PrimaryKeyConstraint('section_id', 'subject_id')
+        )
+    if 'teachers' not in existing:
+        op.create_table('teachers',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('subject_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+    if 'schedules' not in existing:
+        op.create_table('schedules',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('day', sa.String(), nullable=False),
+            sa.Column('time_slot', sa.String(), nullable=False),
+            sa.Column('teacher_id', sa.Integer(), nullable=True),
+            sa.Column('section_id', sa.Integer(), nullable=True),
+            sa.Column('subject_id', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['section_id'], ['sections.id'], ),
+            sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], ),
+            sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('schedules')
+    op.drop_table('teachers')
+    op.drop_table('section_subject')
+    op.drop_table('sections')
+    op.drop_table('subjects')
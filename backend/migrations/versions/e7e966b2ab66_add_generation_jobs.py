@@ -0,0 +1,44 @@
+"""add generation_jobs
+
+Revision ID: e7e966b2ab66
+Revises: c347b1c65b7f
+Create Date: 2026-10-18 09:14:02.530917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7e966b2ab66'
+down_revision = 'c347b1c65b7f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The app may already have created the table through db.create_all()
+    if sa.inspect(op.get_bind()).has_table('generation_jobs'):
+        return
+
+    op.create_table('generation_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('algorithm', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('clear_existing', sa.Boolean(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=True),
+        sa.Column('metrics_json', sa.Text(), nullable=True),
+        sa.Column('progress_json', sa.Text(), nullable=True),
+        sa.Column('execution_time', sa.Float(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('owner', sa.String(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('generation_jobs')
@@ -0,0 +1,40 @@
+"""index schedule listing filters
+
+Revision ID: e83ef22776f9
+Revises: 7b7d0fd66acd
+Create Date: 2026-10-18 11:02:15.904127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e83ef22776f9'
+down_revision = '7b7d0fd66acd'
+branch_labels = None
+depends_on = None
+
+
+# (filter column, index) for the remaining GET /schedules/ filters; ending
+# in id lets a filtered keyset page walk the index without sorting
+PAGE_INDEXES = [
+    ('day', 'ix_schedules_day_page'),
+    ('time_slot', 'ix_schedules_time_slot_page'),
+    ('subject_id', 'ix_schedules_subject_page'),
+]
+
+
+def upgrade():
+    indexes = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('schedules')}
+
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        for column, index_name in PAGE_INDEXES:
+            if index_name not in indexes:
+                batch_op.create_index(index_name, [column, 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        for _, index_name in reversed(PAGE_INDEXES):
+            batch_op.drop_index(index_name)
@@ -8,6 +8,8 @@ from .teachers import Teacher
 from .sections import Section
 from .subjects import Subject
 from .schedules import Schedule
+from .generation_jobs import GenerationJob
+from .data_version import DataVersion
 
 # Export models
-__all__ = ['db', 'Teacher', 'Subject', 'Section', 'Schedule']
+__all__ = ['db', 'Teacher', 'Subject', 'Section', 'Schedule', 'GenerationJob', 'DataVersion']
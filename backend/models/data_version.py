@@ -0,0 +1,27 @@
+from sqlalchemy import update
+from . import db
+
+class DataVersion(db.Model):
+    __tablename__ = 'data_version'
+    
+    # Single row (id 1) counting committed writes to the timetable data
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    
+    @classmethod
+    def current(cls, session):
+        """Return the current data version (0 before the first write)"""
+        return session.query(cls.version).filter_by(id=1).scalar() or 0
+    
+    @classmethod
+    def bump(cls, session):
+        """Increment the version inside the caller's transaction"""
+        # A single UPDATE keeps concurrent writers from losing increments
+        updated = session.execute(
+            update(cls).where(cls.id == 1).values(version=cls.version + 1)
+        ).rowcount
+        if not updated:
+            session.add(cls(id=1, version=1))
+    
+    def __repr__(self):
+        return f"<DataVersion(version={self.version})>"
@@ -0,0 +1,58 @@
+import os
+from sqlalchemy import event
+
+# SQLite pragmas applied to every new connection, overridable through the environment
+SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+
+# Connection pool sizing for the web process threads
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+
+
+def _is_sqlite_file(database_url):
+    return database_url.startswith('sqlite') and database_url not in ('sqlite://', 'sqlite:///:memory:')
+
+
+def engine_options(database_url):
+    """create_engine() keyword arguments for a database URL"""
+    if database_url.startswith('sqlite') and not _is_sqlite_file(database_url):
+        # In-memory databases live in a single connection; keep SQLAlchemy's default pool
+        return {}
+
+    options = {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+    }
+    if _is_sqlite_file(database_url):
+        # Pooled connections are handed between request threads
+        options['connect_args'] = {'check_same_thread': False}
+    else:
+        options['pool_pre_ping'] = True
+    return options
+
+
+def apply_sqlite_pragmas(engine, busy_timeout_ms=SQLITE_BUSY_TIMEOUT_MS):
+    """Set WAL, synchronous, mmap and busy timeout on each new SQLite connection
+
+    With WAL readers keep reading the last committed snapshot while a
+    generation job writes, and the busy timeout makes concurrent writers wait
+    instead of failing with "database is locked". Pass busy_timeout_ms=None
+    to keep the timeout given in connect_args.
+    """
+    if engine.dialect.name != 'sqlite' or not _is_sqlite_file(str(engine.url)):
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f'PRAGMA journal_mode={SQLITE_JOURNAL_MODE}')
+        cursor.execute(f'PRAGMA synchronous={SQLITE_SYNCHRONOUS}')
+        cursor.execute(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}')
+        if busy_timeout_ms is not None:
+            cursor.execute(f'PRAGMA busy_timeout={busy_timeout_ms}')
+        cursor.close()
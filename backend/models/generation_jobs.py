@@ -0,0 +1,38 @@
+import json
+from . import db
+
+class GenerationJob(db.Model):
+    __tablename__ = 'generation_jobs'
+    
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    algorithm = db.Column(db.String, nullable=False)
+    status = db.Column(db.String, nullable=False, default='queued')  # queued, running, completed, failed
+    clear_existing = db.Column(db.Boolean, nullable=False, default=False)
+    count = db.Column(db.Integer, nullable=True)
+    metrics_json = db.Column(db.Text, nullable=True)
+    progress_json = db.Column(db.Text, nullable=True)  # latest ProgressReporter snapshot
+    execution_time = db.Column(db.Float, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    # Lease: the "host:pid" that holds the job and when it last renewed it.
+    # Queued jobs are held by the web process that submitted them, running
+    # jobs by their solver worker; only expired leases are recovered
+    owner = db.Column(db.String, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    
+    @property
+    def metrics(self):
+        return json.loads(self.metrics_json) if self.metrics_json else None
+    
+    @metrics.setter
+    def metrics(self, value):
+        self.metrics_json = json.dumps(value) if value is not None else None
+    
+    @property
+    def progress(self):
+        return json.loads(self.progress_json) if self.progress_json else None
+    
+    def __repr__(self):
+        return f"<GenerationJob(id='{self.id}', algorithm='{self.algorithm}', status='{self.status}')>"
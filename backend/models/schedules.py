@@ -14,10 +14,40 @@ class Schedule(db.Model):
     section_id = db.Column(db.Integer, db.ForeignKey('sections.id'))
     subject_id = db.Column(db.Integer, db.ForeignKey('subjects.id'))
     
+    __table_args__ = (
+        # Listings filter on one column and are ordered by id (the keyset
+        # cursor), so every filter index ends with id: a page is a range scan
+        # of the index with no sort, whatever the table size
+        db.Index('ix_schedules_teacher_page', 'teacher_id', 'id'),
+        db.Index('ix_schedules_section_page', 'section_id', 'id'),
+        db.Index('ix_schedules_day_page', 'day', 'id'),
+        db.Index('ix_schedules_time_slot_page', 'time_slot', 'id'),
+        db.Index('ix_schedules_subject_page', 'subject_id', 'id'),
+        db.UniqueConstraint('day', 'time_slot', 'teacher_id', 'section_id', 'subject_id', name='uq_schedules_entry'),
+    )
+    
     # Relationships
     teacher = db.relationship("Teacher", foreign_keys=[teacher_id], backref="teaching_schedules")
     section = db.relationship("Section", backref="schedules")
     subject = db.relationship("Subject", backref="schedules")
     
+    @classmethod
+    def listing_query(cls, *criteria):
+        """Schedule rows joined to their teacher, section and subject names in one query"""
+        # Projects plain columns so listings never load ORM objects or lazy relationships
+        return (
+            db.session.query(
+                cls.id, cls.day, cls.time_slot,
+                Teacher.id, Teacher.name,
+                Section.id, Section.name,
+                Subject.id, Subject.name, Subject.code
+            )
+            .outerjoin(Teacher, cls.teacher_id == Teacher.id)
+            .outerjoin(Section, cls.section_id == Section.id)
+            .outerjoin(Subject, cls.subject_id == Subject.id)
+            .filter(*criteria)
+            .order_by(cls.id)
+        )
+    
     def __repr__(self):
         return f"<Schedule(day='{self.day}', time='{self.time_slot}', section='{self.section.name}', subject='{self.subject.name}')>"
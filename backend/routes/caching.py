@@ -0,0 +1,57 @@
+from functools import wraps
+from flask import current_app, request
+from models import db, DataVersion
+
+# Serialized GET bodies of the newest data version seen: request path -> body
+_body_cache = {}
+_cache_version = None
+MAX_CACHED_BODIES = 512
+
+
+def _store(version, key, body):
+    """Cache a body, dropping everything rendered for older versions"""
+    global _cache_version
+    if _cache_version is None or version > _cache_version:
+        _body_cache.clear()
+        _cache_version = version
+    elif version < _cache_version:
+        # Rendered by a request that started before a newer write
+        return
+
+    if len(_body_cache) >= MAX_CACHED_BODIES:
+        _body_cache.clear()
+    _body_cache[key] = body
+
+
+def versioned(view):
+    """Serve a JSON GET view with an ETag from the data version and cache its body
+
+    Every write bumps DataVersion in the same transaction, so a body rendered
+    for one version stays valid until the next write. A matching
+    If-None-Match gets a 304 before the view runs at all.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version = DataVersion.current(db.session)
+        etag = str(version)
+
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            key = request.full_path
+            body = _body_cache.get(key) if version == _cache_version else None
+            if body is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                body = response.get_data()
+                _store(version, key, body)
+
+            response = current_app.response_class(body, mimetype='application/json')
+
+        response.set_etag(etag)
+        # Let browsers keep the body but revalidate it on every request
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    return wrapper
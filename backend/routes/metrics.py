@@ -0,0 +1,9 @@
+from flask import Blueprint, Response
+from telemetry import REGISTRY
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('', methods=['GET'])
+def get_metrics():
+    """Request, generation and solver metrics in Prometheus text format"""
+    return Response(REGISTRY.exposition(), content_type=REGISTRY.CONTENT_TYPE)
@@ -1,114 +1,186 @@
-from flask import Blueprint, jsonify, request
-from models import db, Schedule, Teacher, Section, Subject
-from scripts.moga_schedule import create_moga_schedule
-from scripts.hill_climbing import create_hill_climbing_schedule
-from scripts.simple_genetic import create_simple_genetic_schedule
-from scripts.ant_colony import create_ant_colony_schedule
+import os
+import json
+import time
+import threading
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from sqlalchemy.exc import IntegrityError
+from models import db, Schedule, Teacher, Section, GenerationJob, DataVersion
+from jobs import submit_job
+from scripts.timetable import DAYS, TIME_SLOTS
+from routes.caching import versioned
 
 schedules_bp = Blueprint('schedules', __name__)
 
-@schedules_bp.route('/', methods=['GET'])
-def get_all_schedules():
-    """Get all schedules with related data"""
-    schedules = Schedule.query.all()
-    result = []
+# Page size of GET /schedules/ (default and upper bound of ?limit=)
+SCHEDULE_PAGE_SIZE = 500
+SCHEDULE_PAGE_SIZE_MAX = 2000
+
+# Event stream polling of the jobs table
+SSE_POLL_SECONDS = 0.5
+SSE_HEARTBEAT_SECONDS = 15
+# Each open stream holds a server thread for the whole job; past this many
+# per process new streams get 503 and clients fall back to polling the job
+SSE_MAX_STREAMS = int(os.getenv('SSE_MAX_STREAMS', '4'))
+_sse_slots = threading.BoundedSemaphore(SSE_MAX_STREAMS)
+
+def _serialize_schedule_row(row, include=('teacher', 'section', 'subject')):
+    """Build the listing dict from a Schedule.listing_query() row tuple"""
+    (schedule_id, day, time_slot, teacher_id, teacher_name,
+     section_id, section_name, subject_id, subject_name, subject_code) = row
     
-    for schedule in schedules:
-        schedule_data = {
-            'id': schedule.id,
-            'day': schedule.day,
-            'time_slot': schedule.time_slot,
+    schedule_data = {
+        'id': schedule_id,
+        'day': day,
+        'time_slot': time_slot,
+    }
+    
+    # Related objects are only included when the foreign key resolves
+    if 'teacher' in include and teacher_id is not None:
+        schedule_data['teacher'] = {
+            'id': teacher_id,
+            'name': teacher_name
         }
         
-        # Include teacher if available
-        if schedule.teacher:
-            schedule_data['teacher'] = {
-                'id': schedule.teacher.id,
-                'name': schedule.teacher.name
-            }
-            
-        # Include section if available
-        if schedule.section:
-            schedule_data['section'] = {
-                'id': schedule.section.id,
-                'name': schedule.section.name
-            }
-            
-        # Include subject if available
-        if schedule.subject:
-            schedule_data['subject'] = {
-                'id': schedule.subject.id,
-                'name': schedule.subject.name,
-                'code': schedule.subject.code
-            }
-            
-        result.append(schedule_data)
+    if 'section' in include and section_id is not None:
+        schedule_data['section'] = {
+            'id': section_id,
+            'name': section_name
+        }
+        
+    if 'subject' in include and subject_id is not None:
+        schedule_data['subject'] = {
+            'id': subject_id,
+            'name': subject_name,
+            'code': subject_code
+        }
     
-    return jsonify(result)
+    return schedule_data
+
+@schedules_bp.route('/', methods=['GET'])
+@versioned
+def get_all_schedules():
+    """Get one page of schedules with related data, optionally filtered"""
+    criteria = []
+    
+    # Equality filters, each backed by an index on the schedules table
+    for param in ('day', 'time_slot'):
+        value = request.args.get(param)
+        if value is not None:
+            criteria.append(getattr(Schedule, param) == value)
+    
+    for param in ('teacher_id', 'section_id', 'subject_id'):
+        value = request.args.get(param)
+        if value is not None:
+            if not value.isdigit():
+                return jsonify({'error': f'{param} must be an integer'}), 400
+            criteria.append(getattr(Schedule, param) == int(value))
+    
+    limit = request.args.get('limit', str(SCHEDULE_PAGE_SIZE))
+    if not limit.isdigit() or not 1 <= int(limit) <= SCHEDULE_PAGE_SIZE_MAX:
+        return jsonify({'error': f'limit must be between 1 and {SCHEDULE_PAGE_SIZE_MAX}'}), 400
+    limit = int(limit)
+    
+    # Keyset pagination: the cursor is the last id of the previous page, so
+    # every page is an index range scan instead of an OFFSET over skipped rows
+    cursor = request.args.get('cursor')
+    if cursor is not None:
+        if not cursor.isdigit():
+            return jsonify({'error': 'Invalid cursor'}), 400
+        criteria.append(Schedule.id > int(cursor))
+    
+    # Fetch one extra row to learn whether another page exists
+    rows = Schedule.listing_query(*criteria).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    return jsonify({
+        'items': [_serialize_schedule_row(row) for row in rows],
+        'next_cursor': str(rows[-1][0]) if has_more else None
+    })
 
 @schedules_bp.route('/teacher/<int:teacher_id>', methods=['GET'])
+@versioned
 def get_teacher_schedule(teacher_id):
     """Get schedule for a specific teacher"""
-    schedules = Schedule.query.filter_by(teacher_id=teacher_id).all()
-    result = []
-    
-    for schedule in schedules:
-        schedule_data = {
-            'id': schedule.id,
-            'day': schedule.day,
-            'time_slot': schedule.time_slot,
-        }
-        
-        # Include section if available
-        if schedule.section:
-            schedule_data['section'] = {
-                'id': schedule.section.id,
-                'name': schedule.section.name
-            }
-            
-        # Include subject if available
-        if schedule.subject:
-            schedule_data['subject'] = {
-                'id': schedule.subject.id,
-                'name': schedule.subject.name,
-                'code': schedule.subject.code
-            }
-            
-        result.append(schedule_data)
-    
-    return jsonify(result)
+    rows = Schedule.listing_query(Schedule.teacher_id == teacher_id).all()
+    return jsonify([_serialize_schedule_row(row, include=('section', 'subject')) for row in rows])
 
 @schedules_bp.route('/section/<int:section_id>', methods=['GET'])
+@versioned
 def get_section_schedule(section_id):
     """Get schedule for a specific section"""
-    schedules = Schedule.query.filter_by(section_id=section_id).all()
-    result = []
+    rows = Schedule.listing_query(Schedule.section_id == section_id).all()
+    return jsonify([_serialize_schedule_row(row, include=('teacher', 'subject')) for row in rows])
+
+# Grid views: grid owner -> entity whose id is stored next to the subject in a cell
+GRID_VIEWS = {
+    'section': 'teacher',
+    'teacher': 'section',
+}
+GRID_OWNER_MODELS = {
+    'section': Section,
+    'teacher': Teacher,
+}
+
+@schedules_bp.route('/grid/<view>', methods=['GET'])
+@schedules_bp.route('/grid/<view>/<int:owner_id>', methods=['GET'])
+@versioned
+def get_schedule_grid(view, owner_id=None):
+    """Get day x time_slot timetable grids per section or per teacher"""
+    if view not in GRID_VIEWS:
+        return jsonify({'error': f'Unknown grid view: {view}'}), 404
+    other = GRID_VIEWS[view]
+    owner_column = getattr(Schedule, f'{view}_id')
     
-    for schedule in schedules:
-        schedule_data = {
-            'id': schedule.id,
-            'day': schedule.day,
-            'time_slot': schedule.time_slot,
-        }
+    # Filter on the joined owner, so rows whose foreign key does not resolve
+    # (a deleted or mistyped section/teacher) are left out of the grids
+    criteria = [GRID_OWNER_MODELS[view].id.isnot(None)]
+    if owner_id is not None:
+        criteria.append(owner_column == owner_id)
+    
+    # One joined query gives both the cells and the names for the lookup tables
+    rows = [_serialize_schedule_row(row) for row in Schedule.listing_query(*criteria)]
+    
+    # Axes follow the solvers' order; values entered by hand are appended
+    days = list(DAYS)
+    time_slots = list(TIME_SLOTS)
+    for row in rows:
+        if row['day'] not in days:
+            days.append(row['day'])
+        if row['time_slot'] not in time_slots:
+            time_slots.append(row['time_slot'])
+    day_index = {day: i for i, day in enumerate(days)}
+    time_index = {time_slot: i for i, time_slot in enumerate(time_slots)}
+    
+    teachers, sections, subjects, grids = {}, {}, {}, {}
+    for row in rows:
+        if 'teacher' in row:
+            teachers[row['teacher']['id']] = row['teacher']['name']
+        if 'section' in row:
+            sections[row['section']['id']] = row['section']['name']
+        if 'subject' in row:
+            subjects[row['subject']['id']] = {'name': row['subject']['name'], 'code': row['subject']['code']}
         
-        # Include teacher if available
-        if schedule.teacher:
-            schedule_data['teacher'] = {
-                'id': schedule.teacher.id,
-                'name': schedule.teacher.name
-            }
-            
-        # Include subject if available
-        if schedule.subject:
-            schedule_data['subject'] = {
-                'id': schedule.subject.id,
-                'name': schedule.subject.name,
-                'code': schedule.subject.code
-            }
-            
-        result.append(schedule_data)
+        owner = row[view]['id']
+        if owner not in grids:
+            grids[owner] = [[[] for _ in time_slots] for _ in days]
+        
+        # A cell lists [subject_id, other_id] pairs; more than one means a conflict
+        grids[owner][day_index[row['day']]][time_index[row['time_slot']]].append([
+            row['subject']['id'] if 'subject' in row else None,
+            row[other]['id'] if other in row else None
+        ])
     
-    return jsonify(result)
+    return jsonify({
+        'view': view,
+        'days': days,
+        'time_slots': time_slots,
+        'cell_fields': ['subject_id', f'{other}_id'],
+        'teachers': teachers,
+        'sections': sections,
+        'subjects': subjects,
+        'grids': grids
+    })
 
 @schedules_bp.route('/', methods=['POST'])
 def create_schedule():
@@ -132,6 +204,7 @@ def create_schedule():
     
     try:
         db.session.add(new_schedule)
+        DataVersion.bump(db.session)
         db.session.commit()
         
         # Return created schedule with related data
@@ -161,39 +234,25 @@ def create_schedule():
             }
         
         return jsonify(result), 201
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'An identical schedule entry already exists'}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-@schedules_bp.route('/generate/moga', methods=['POST'])
-def generate_schedules():
-    """Generate schedules using MOGA algorithm"""
+def _queue_generation(algorithm):
+    """Queue a generation job and return its id without waiting for the solver"""
     try:
-        # Clear existing schedules if specified
-        if request.json and request.json.get('clear_existing', False):
-            Schedule.query.delete()
-            db.session.commit()
-        
-        # Generate schedules using MOGA algorithm
-        num_schedules, metrics, execution_time = create_moga_schedule(
-            db.session, 
-            Section, 
-            Subject, 
-            Teacher, 
-            Schedule
-        )
-        
-        db.session.commit()
+        clear_existing = bool(request.json and request.json.get('clear_existing', False))
+        job = submit_job(algorithm, clear_existing=clear_existing)
         
         return jsonify({
-            'status': 'success',
-            'message': f'{num_schedules} schedules generated successfully',
-            'data': {
-                'count': num_schedules,
-                'metrics': metrics,
-                'execution_time_seconds': round(execution_time, 2)
-            }
-        }), 201
+            'status': 'queued',
+            'message': f'Generation job queued using {algorithm}',
+            'job_id': job.id,
+            'status_url': f'/schedules/jobs/{job.id}'
+        }), 202
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -201,117 +260,116 @@ def generate_schedules():
             'message': str(e)
         }), 500
 
+@schedules_bp.route('/generate/moga', methods=['POST'])
+def generate_schedules():
+    """Generate schedules using MOGA algorithm"""
+    return _queue_generation('moga')
+
 @schedules_bp.route('/generate/hill-climbing', methods=['POST'])
 def generate_schedules_hill_climbing():
     """Generate schedules using Hill Climbing algorithm"""
-    try:
-        # Clear existing schedules if specified
-        if request.json and request.json.get('clear_existing', False):
-            Schedule.query.delete()
-            db.session.commit()
-        
-        # Generate schedules using Hill Climbing algorithm
-        num_schedules, metrics, execution_time = create_hill_climbing_schedule(
-            db.session, 
-            Section, 
-            Subject, 
-            Teacher, 
-            Schedule
-        )
-        
-        db.session.commit()
-        
-        return jsonify({
-            'status': 'success',
-            'message': f'{num_schedules} schedules generated successfully using Hill Climbing',
-            'data': {
-                'count': num_schedules,
-                'algorithm': 'hill-climbing',
-                'metrics': metrics,
-                'execution_time_seconds': round(execution_time, 2)
-            }
-        }), 201
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({
-            'status': 'error',
-            'message': str(e)
-        }), 500
+    return _queue_generation('hill-climbing')
 
 @schedules_bp.route('/generate/simple-genetic', methods=['POST'])
 def generate_schedules_simple_genetic():
     """Generate schedules using Simple Genetic algorithm"""
-    try:
-        # Clear existing schedules if specified
-        if request.json and request.json.get('clear_existing', False):
-            Schedule.query.delete()
-            db.session.commit()
-        
-        # Generate schedules using Simple Genetic algorithm
-        num_schedules, metrics, execution_time = create_simple_genetic_schedule(
-            db.session, 
-            Section, 
-            Subject, 
-            Teacher, 
-            Schedule
-        )
-        
-        db.session.commit()
-        
-        return jsonify({
-            'status': 'success',
-            'message': f'{num_schedules} schedules generated successfully using Simple Genetic Algorithm',
-            'data': {
-                'count': num_schedules,
-                'algorithm': 'simple-genetic',
-                'metrics': metrics,
-                'execution_time_seconds': round(execution_time, 2)
-            }
-        }), 201
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({
-            'status': 'error',
-            'message': str(e)
-        }), 500
+    return _queue_generation('simple-genetic')
 
 @schedules_bp.route('/generate/ant-colony', methods=['POST'])
 def generate_schedules_ant_colony():
     """Generate schedules using Ant Colony Optimization algorithm"""
-    try:
-        # Clear existing schedules if specified
-        if request.json and request.json.get('clear_existing', False):
-            Schedule.query.delete()
-            db.session.commit()
-        
-        # Generate schedules using Ant Colony Optimization
-        num_schedules, metrics, execution_time = create_ant_colony_schedule(
-            db.session, 
-            Section, 
-            Subject, 
-            Teacher, 
-            Schedule
-        )
-        
-        db.session.commit()
-        
-        return jsonify({
-            'status': 'success',
-            'message': f'{num_schedules} schedules generated successfully using Ant Colony Optimization',
-            'data': {
-                'count': num_schedules,
-                'algorithm': 'ant-colony',
-                'metrics': metrics,
-                'execution_time_seconds': round(execution_time, 2)
-            }
-        }), 201
-    except Exception as e:
-        db.session.rollback()
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"Ant Colony Error: {str(e)}\n{error_details}")
+    return _queue_generation('ant-colony')
+
+def _job_payload(job):
+    """Serialize a generation job for the status endpoint and event stream"""
+    result = {
+        'job_id': job.id,
+        'algorithm': job.algorithm,
+        'status': job.status,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'progress': job.progress,
+    }
+    
+    if job.status == 'completed':
+        result['message'] = f'{job.count} schedules generated successfully'
+        # Same shape as the former synchronous generate response
+        result['data'] = {
+            'count': job.count,
+            'algorithm': job.algorithm,
+            'metrics': job.metrics,
+            'execution_time_seconds': round(job.execution_time, 2)
+        }
+    elif job.status == 'failed':
+        result['message'] = job.error
+    
+    return result
+
+def _sse(event, data):
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@schedules_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_generation_job(job_id):
+    """Get status and results of a generation job"""
+    job = GenerationJob.query.get(job_id)
+    
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(_job_payload(job))
+
+@schedules_bp.route('/jobs/<job_id>/events', methods=['GET'])
+def stream_generation_job(job_id):
+    """Stream progress of a generation job as Server-Sent Events"""
+    if not GenerationJob.query.get(job_id):
+        return jsonify({'error': 'Job not found'}), 404
+    
+    if not _sse_slots.acquire(blocking=False):
         return jsonify({
-            'status': 'error',
-            'message': str(e),
-            'details': error_details if request.json and request.json.get('debug', False) else None
-        }), 500
+            'error': 'Too many open progress streams; poll the job status instead',
+            'status_url': f'/schedules/jobs/{job_id}'
+        }), 503, {'Retry-After': str(SSE_HEARTBEAT_SECONDS)}
+    
+    def events():
+        last_status = None
+        last_progress = None
+        last_sent = time.monotonic()
+        
+        while True:
+            # Drop the identity map so each poll sees the worker's latest commit
+            db.session.expire_all()
+            job = GenerationJob.query.get(job_id)
+            
+            if job.status != last_status:
+                last_status = job.status
+                last_sent = time.monotonic()
+                yield _sse('status', {'job_id': job.id, 'status': job.status})
+            
+            if job.progress_json and job.progress_json != last_progress:
+                last_progress = job.progress_json
+                last_sent = time.monotonic()
+                yield _sse('progress', job.progress)
+            
+            if job.status in ('completed', 'failed'):
+                yield _sse(job.status, _job_payload(job))
+                return
+            
+            # Comment lines keep proxies from closing an idle stream
+            if time.monotonic() - last_sent >= SSE_HEARTBEAT_SECONDS:
+                last_sent = time.monotonic()
+                yield ": heartbeat\n\n"
+            
+            # Release the connection between polls
+            db.session.remove()
+            time.sleep(SSE_POLL_SECONDS)
+    
+    response = Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # The server closes the response when the stream ends or the client leaves
+    response.call_on_close(_sse_slots.release)
+    return response
@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify
 from models.sections import Section
-from models import db
+from models import db, DataVersion
+from routes.caching import versioned
 
 sections_bp = Blueprint('sections', __name__)
 
 @sections_bp.route('/', methods=['GET'])
+@versioned
 def get_all_sections():
     """Get all sections"""
     sections = Section.query.all()
@@ -17,6 +19,7 @@ def get_all_sections():
     return jsonify(result)
 
 @sections_bp.route('/<int:section_id>', methods=['GET'])
+@versioned
 def get_section(section_id):
     """Get a specific section by ID"""
     section = Section.query.get_or_404(section_id)
@@ -37,6 +40,7 @@ def create_section():
     
     try:
         db.session.add(new_section)
+        DataVersion.bump(db.session)
         db.session.commit()
         return jsonify({
             'id': new_section.id,
@@ -58,6 +62,7 @@ def update_section(section_id):
     
     try:
         section.name = data['name']
+        DataVersion.bump(db.session)
         db.session.commit()
         return jsonify({
             'id': section.id,
@@ -75,6 +80,7 @@ def delete_section(section_id):
     
     try:
         db.session.delete(section)
+        DataVersion.bump(db.session)
         db.session.commit()
         return jsonify({'message': f'Section {section_id} deleted successfully'})
     except Exception as e:
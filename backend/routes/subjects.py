@@ -1,9 +1,11 @@
 from flask import Blueprint, jsonify, request
 from models import db, Subject
+from routes.caching import versioned
 
 subjects_bp = Blueprint('subjects', __name__)
 
 @subjects_bp.route('/', methods=['GET'])
+@versioned
 def get_all_subjects():
     """Get all subjects"""
     subjects = Subject.query.all()
@@ -18,6 +20,7 @@ def get_all_subjects():
     return jsonify(result)
 
 @subjects_bp.route('/<int:subject_id>', methods=['GET'])
+@versioned
 def get_subject(subject_id):
     """Get a subject by ID"""
     subject = Subject.query.get(subject_id)
@@ -37,6 +40,7 @@ def get_subject(subject_id):
     return jsonify(result)
 
 @subjects_bp.route('/section/<int:section_id>', methods=['GET'])
+@versioned
 def get_subjects_by_section(section_id):
     """Get all subjects for a specific section"""
     # Assuming there's a relationship between subjects and sections through a join table or direct relationship
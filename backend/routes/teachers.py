@@ -1,9 +1,11 @@
 from flask import Blueprint, jsonify, request
 from models import db, Teacher
+from routes.caching import versioned
 
 teachers_bp = Blueprint('teachers', __name__)
 
 @teachers_bp.route('/', methods=['GET'])
+@versioned
 def get_all_teachers():
     """Get all teachers"""
     teachers = Teacher.query.all()
@@ -20,6 +22,7 @@ def get_all_teachers():
     return jsonify(result)
 
 @teachers_bp.route('/<int:teacher_id>', methods=['GET'])
+@versioned
 def get_teacher(teacher_id):
     """Get a teacher by ID"""
     teacher = Teacher.query.get(teacher_id)
@@ -40,6 +43,7 @@ def get_teacher(teacher_id):
     return jsonify(result)
 
 @teachers_bp.route('/subject/<int:subject_id>', methods=['GET'])
+@versioned
 def get_teachers_by_subject(subject_id):
     """Get all teachers teaching a specific subject"""
     teachers = Teacher.query.filter_by(subject_id=subject_id).all()
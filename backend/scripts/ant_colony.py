@@ -1,16 +1,15 @@
+import os
 import random
 import numpy as np
 import time
-from collections import defaultdict
+import concurrent.futures
+from array import array
+from multiprocessing import shared_memory
+from .schedule_problem import ScheduleSolution
+from .timing import PhaseTimer
 
 class AntColonyScheduler:
-    def __init__(self, session, Section, Subject, Teacher, Schedule):
-        self.session = session
-        self.Section = Section
-        self.Subject = Subject
-        self.Teacher = Teacher
-        self.Schedule = Schedule
-        
+    def __init__(self, problem, num_workers=None, seed=None, progress=None, timer=None):
         # ACO parameters
         self.NUM_ANTS = 20
         self.MAX_ITERATIONS = 50
@@ -19,305 +18,211 @@ class AntColonyScheduler:
         self.BETA = 2.0   # Heuristic importance
         self.Q = 100.0    # Pheromone deposit factor
         
-        # Load data from database
-        self.teachers = session.query(Teacher).all()
-        self.sections = session.query(Section).all()
-        self.subjects = session.query(Subject).all()
+        # Parallel construction: ants are split across NUM_WORKERS processes.
+        # Runs are reproducible for a fixed SEED and NUM_WORKERS.
+        self.NUM_WORKERS = num_workers if num_workers is not None else int(os.getenv('ACO_WORKERS', '1'))
+        self.SEED = seed
+        
+        # Stop the search after TIME_LIMIT seconds and keep the best so far (None = no limit)
+        self.TIME_LIMIT = None
+        
+        # Optional ProgressReporter fed once per iteration
+        self.progress = progress
         
-        # Time slots and days
-        self.time_slots = ["7:30-8:30", "8:30-9:30", "9:30-10:30", "10:30-11:30", 
-                           "1:00-2:00", "2:00-3:00", "3:00-4:00", "4:00-5:00"]
-        self.days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+        # PhaseTimer charged with the init, search and evaluate phases and the run counters
+        self.timer = timer if timer is not None else PhaseTimer()
         
-        # Create mappings for quick reference
-        self.teacher_subjects = self._map_teacher_subjects()
+        # Integer-indexed problem model shared by all schedulers; built from
+        # the database by scripts.orm or from a plain dict with ScheduleProblem.from_dict
+        self.problem = problem
+        self.days = self.problem.days
+        self.time_slots = self.problem.time_slots
+        
+        # Candidate teachers and their specialist factor per gene, as arrays
+        self.gene_candidates = [np.array(candidates, dtype=np.int64) for candidates in self.problem.gene_teachers]
+        self.gene_specialist_factor = [
+            np.array([2.0 if self.problem.is_suitable(teacher, subject) else 1.0 for teacher in candidates])
+            for candidates, subject in zip(self.problem.gene_teachers, self.problem.gene_subject)
+        ]
         
         # Initialize pheromone structure
         self.pheromones = self._initialize_pheromones()
         
-        # Define required schedules
-        self.required_schedules = self._get_required_schedules()
-        
-    def _map_teacher_subjects(self):
-        """Map teachers to their subjects based on the subject_id relationship"""
-        teacher_subjects = defaultdict(list)
-        for teacher in self.teachers:
-            # Add the directly assigned subject
-            teacher_subjects[teacher.id].append(teacher.subject_id)
-            
-        return teacher_subjects
-    
-    def _get_required_schedules(self):
-        """Get list of required section-subject combinations"""
-        required = []
-        for section in self.sections:
-            for subject in self.subjects:
-                if self._section_needs_subject(section, subject):
-                    required.append((section.id, subject.id))
-        return required
-    
-    def _section_needs_subject(self, section, subject):
-        """Determine if a section needs a particular subject"""
-        # Implement custom logic here if needed
-        return True  # Default assumption
+    def __getstate__(self):
+        """Drop pheromones, the progress reporter and timer when shipped to worker processes"""
+        state = self.__dict__.copy()
+        for key in ('pheromones', 'progress', 'timer'):
+            state.pop(key, None)
+        return state
     
     def _initialize_pheromones(self):
-        """Initialize pheromone trails to a small positive value"""
-        pheromones = {}
-        
-        # Structure: (section_id, subject_id, day, time_slot, teacher_id) -> pheromone value
-        for section in self.sections:
-            for subject in self.subjects:
-                if not self._section_needs_subject(section, subject):
-                    continue
-                    
-                for day in self.days:
-                    for time_slot in self.time_slots:
-                        for teacher in self.teachers:
-                            if subject.id in self.teacher_subjects[teacher.id]:
-                                key = (section.id, subject.id, day, time_slot, teacher.id)
-                                pheromones[key] = 1.0  # Initial pheromone value
+        """Initialize pheromone trails as a dense (gene, slot, eligible teacher) array"""
+        problem = self.problem
         
-        return pheromones
-    
-    def _calculate_heuristic(self, section_id, subject_id, day, time_slot, teacher_id, current_solution):
-        """Calculate heuristic value for assignment (higher is better)"""
-        heuristic = 1.0  # Base value
-        
-        # Check teacher conflicts in this time slot
-        teacher_busy = any(
-            entry['teacher_id'] == teacher_id and 
-            entry['day'] == day and 
-            entry['time_slot'] == time_slot 
-            for entry in current_solution
-        )
+        # Column c of a gene is the c-th teacher in problem.gene_teachers[gene];
+        # genes with fewer eligible teachers leave their trailing columns at zero
+        width = max((len(candidates) for candidates in problem.gene_teachers), default=0)
+        pheromones = np.zeros((problem.num_genes, problem.num_slots, width), dtype=np.float64)
+        self.teacher_columns = np.full((problem.num_genes, max(problem.num_teachers, 1)), -1, dtype=np.int64)
         
-        # Check section conflicts in this time slot
-        section_busy = any(
-            entry['section_id'] == section_id and 
-            entry['day'] == day and 
-            entry['time_slot'] == time_slot 
-            for entry in current_solution
-        )
+        for gene, candidates in enumerate(problem.gene_teachers):
+            subject = problem.gene_subject[gene]
+            for column, teacher in enumerate(candidates):
+                self.teacher_columns[gene, teacher] = column
+                # Specialists start at 1.0, fallback teachers at a small 0.1
+                pheromones[gene, :, column] = 1.0 if problem.is_suitable(teacher, subject) else 0.1
         
-        # Check if teacher specializes in this subject
-        teacher_specializes = subject_id in self.teacher_subjects[teacher_id]
+        print(f"Pheromone array {pheromones.shape}: {pheromones.nbytes / 1024:.1f} KiB")
         
-        # Calculate teacher's current load in solution
-        teacher_load = sum(1 for entry in current_solution if entry['teacher_id'] == teacher_id)
+        return pheromones
+    
+    def _calculate_heuristic(self, gene, state):
+        """Heuristic values (higher is better) for every (slot, candidate teacher) of a gene"""
+        candidates = self.gene_candidates[gene]
         
-        # Adjust heuristic based on constraints
-        if teacher_busy or section_busy:
-            heuristic = 0.01  # Very low but not zero to allow some exploration
+        # Teacher or section already busy in the slot -> very low but not zero
+        busy = state.teacher_busy[candidates].T | state.section_busy[self.problem.gene_section[gene]][:, None]
+        heuristic = np.where(busy, 0.01, 1.0)
+        
+        # Favor teachers that specialize in this subject
+        heuristic *= self.gene_specialist_factor[gene]
         
-        if teacher_specializes:
-            heuristic *= 2.0
-            
         # Balance teacher loads - favor less busy teachers
-        heuristic *= (1.0 + 0.1 / (teacher_load + 1))
+        heuristic *= 1.0 + 0.1 / (state.loads[candidates] + 1)
         
         return heuristic
     
-    def _select_assignment(self, section_id, subject_id, current_solution):
-        """Select day, time, and teacher for a section-subject combination"""
-        candidates = []
-        
-        # Get all possible assignments
-        for day in self.days:
-            for time_slot in self.time_slots:
-                suitable_teachers = [
-                    teacher.id for teacher in self.teachers 
-                    if subject_id in self.teacher_subjects[teacher.id]
-                ]
-                
-                if not suitable_teachers:
-                    suitable_teachers = [teacher.id for teacher in self.teachers]
-                
-                for teacher_id in suitable_teachers:
-                    # Get pheromone value
-                    key = (section_id, subject_id, day, time_slot, teacher_id)
-                    # Ensure the key exists in the pheromones dictionary
-                    if key not in self.pheromones:
-                        self.pheromones[key] = 0.1
-                    pheromone = self.pheromones[key]
-                    
-                    # Get heuristic value
-                    heuristic = self._calculate_heuristic(
-                        section_id, subject_id, day, time_slot, teacher_id, current_solution
-                    )
-                    
-                    # Calculate probability
-                    probability = (pheromone ** self.ALPHA) * (heuristic ** self.BETA)
-                    
-                    candidates.append({
-                        'day': day,
-                        'time_slot': time_slot,
-                        'teacher_id': teacher_id,
-                        'section_id': section_id,
-                        'subject_id': subject_id,
-                        'probability': probability
-                    })
+    def _select_assignment(self, gene, state, rng):
+        """Select a (slot, teacher) record for one section-subject gene"""
+        candidates = self.gene_candidates[gene]
+        num_candidates = len(candidates)
+        
+        # tau^alpha * eta^beta for all slots x candidate teachers at once
+        pheromone = self.pheromones[gene, :, :num_candidates]
+        weights = np.power(pheromone, self.ALPHA) * np.power(self._calculate_heuristic(gene, state), self.BETA)
+        cumulative = np.cumsum(weights, axis=None)
+        total_prob = cumulative[-1]
         
         # If no viable candidates, choose randomly
-        if not candidates or all(c['probability'] == 0 for c in candidates):
-            day = random.choice(self.days)
-            time_slot = random.choice(self.time_slots)
-            
-            suitable_teachers = [
-                teacher.id for teacher in self.teachers 
-                if subject_id in self.teacher_subjects[teacher.id]
-            ]
-            
-            if not suitable_teachers:
-                suitable_teachers = [teacher.id for teacher in self.teachers]
-                
-            teacher_id = random.choice(suitable_teachers)
-            
-            return {
-                'day': day,
-                'time_slot': time_slot,
-                'teacher_id': teacher_id,
-                'section_id': section_id,
-                'subject_id': subject_id
-            }
-        
-        # Normalize probabilities
-        total_prob = sum(c['probability'] for c in candidates)
-        
-        if total_prob == 0:
-            # Random selection if all probabilities are zero
-            return random.choice(candidates)
-        
-        # Roulette wheel selection
-        r = random.random() * total_prob
-        cumulative_prob = 0
-        
-        for candidate in candidates:
-            cumulative_prob += candidate['probability']
-            if r <= cumulative_prob:
-                return {
-                    'day': candidate['day'],
-                    'time_slot': candidate['time_slot'],
-                    'teacher_id': candidate['teacher_id'],
-                    'section_id': candidate['section_id'],
-                    'subject_id': candidate['subject_id']
-                }
-        
-        # Fallback to last candidate
-        candidate = candidates[-1]
-        return {
-            'day': candidate['day'],
-            'time_slot': candidate['time_slot'],
-            'teacher_id': candidate['teacher_id'],
-            'section_id': candidate['section_id'],
-            'subject_id': candidate['subject_id']
-        }
+        if not total_prob > 0:
+            return rng.randrange(self.problem.num_slots), int(rng.choice(candidates))
+        
+        # Roulette wheel selection by binary search over the cumulative weights
+        index = int(np.searchsorted(cumulative, rng.random() * total_prob))
+        slot, column = divmod(min(index, cumulative.size - 1), num_candidates)
+        return slot, int(candidates[column])
     
-    def _construct_solution(self):
+    def _construct_solution(self, rng):
         """Construct a complete solution (one ant's path)"""
-        solution = []
+        state = AntState(self.problem)
         
         # Randomize the order of required schedules
-        required_shuffled = self.required_schedules.copy()
-        random.shuffle(required_shuffled)
+        required_shuffled = list(range(self.problem.num_genes))
+        rng.shuffle(required_shuffled)
         
         # Build solution incrementally
-        for section_id, subject_id in required_shuffled:
-            assignment = self._select_assignment(section_id, subject_id, solution)
-            solution.append(assignment)
+        for gene in required_shuffled:
+            slot, teacher = self._select_assignment(gene, state, rng)
+            state.assign(gene, slot, teacher)
         
-        return solution
+        return state.solution
     
     def _evaluate_solution(self, solution):
         """Evaluate solution quality (higher is better)"""
-        # 1. Teacher conflicts (lower is better)
-        teacher_slots = defaultdict(int)
-        for entry in solution:
-            key = (entry['teacher_id'], entry['day'], entry['time_slot'])
-            teacher_slots[key] += 1
-        
-        teacher_conflicts = sum(count - 1 for count in teacher_slots.values() if count > 1)
-        
-        # 2. Section conflicts (lower is better)
-        section_slots = defaultdict(int)
-        for entry in solution:
-            key = (entry['section_id'], entry['day'], entry['time_slot'])
-            section_slots[key] += 1
-        
-        section_conflicts = sum(count - 1 for count in section_slots.values() if count > 1)
-        
-        # 3. Teacher load balance
-        teacher_loads = defaultdict(int)
-        for entry in solution:
-            teacher_loads[entry['teacher_id']] += 1
-        
-        avg_load = sum(teacher_loads.values()) / max(len(teacher_loads), 1)
-        load_variance = sum((load - avg_load) ** 2 for load in teacher_loads.values()) / max(len(teacher_loads), 1)
-        
-        # 4. Teacher-subject suitability
-        suitability = sum(
-            1 for entry in solution 
-            if entry['subject_id'] in self.teacher_subjects[entry['teacher_id']]
-        )
+        metrics = self.problem.evaluate(solution)
         
         # Combined score (higher is better)
         score = (
             100.0
-            - 10.0 * teacher_conflicts
-            - 10.0 * section_conflicts
-            - 2.0 * load_variance
-            + 1.0 * suitability
+            - 10.0 * metrics['teacher_conflicts']
+            - 10.0 * metrics['section_conflicts']
+            - 2.0 * metrics['load_variance']
+            + 1.0 * metrics['suitability']
         )
         
-        return max(0.1, score), {
-            'teacher_conflicts': teacher_conflicts,
-            'section_conflicts': section_conflicts,
-            'load_variance': load_variance,
-            'suitability': suitability
-        }
+        return max(0.1, score), metrics
     
     def _update_pheromones(self, solutions, scores):
         """Update pheromone trails based on solution quality"""
         # Evaporation
-        for key in self.pheromones:
-            self.pheromones[key] *= (1 - self.EVAPORATION_RATE)
-        
-        # Add new pheromones
-        for solution, score in zip(solutions, scores):
-            for entry in solution:
-                try:
-                    key = (
-                        entry['section_id'], 
-                        entry['subject_id'], 
-                        entry['day'], 
-                        entry['time_slot'], 
-                        entry['teacher_id']
-                    )
-                    
-                    # Ensure the key exists before updating
-                    if key not in self.pheromones:
-                        self.pheromones[key] = 0.1
-                        
-                    # Deposit pheromone proportional to solution quality
-                    self.pheromones[key] += self.Q * score
-                except (TypeError, KeyError) as e:
-                    # Skip invalid entries and log error
-                    print(f"Error updating pheromones: {e}, entry: {entry}")
-                    continue
+        self.pheromones *= (1 - self.EVAPORATION_RATE)
+        
+        if not solutions:
+            return
+        
+        # Deposit pheromone proportional to solution quality, all ants at once
+        num_genes = self.problem.num_genes
+        genes = np.tile(np.arange(num_genes, dtype=np.int64), len(solutions))
+        slots = np.concatenate([np.frombuffer(solution.slots, dtype=np.intc) for solution in solutions])
+        teachers = np.concatenate([np.frombuffer(solution.teachers, dtype=np.intc) for solution in solutions])
+        deposits = np.repeat(self.Q * np.asarray(scores, dtype=np.float64), num_genes)
+        np.add.at(self.pheromones, (genes, slots, self.teacher_columns[genes, teachers]), deposits)
+    
+    def _ant_rng(self, entropy, iteration, worker):
+        """Independent random stream for one worker in one iteration"""
+        seed_state = np.random.SeedSequence(entropy, spawn_key=(iteration, worker)).generate_state(4)
+        return random.Random(int.from_bytes(seed_state.tobytes(), 'little'))
+    
+    def _split_ants(self, num_workers):
+        """Number of ants each worker builds per iteration"""
+        base, extra = divmod(self.NUM_ANTS, num_workers)
+        return [base + (1 if worker < extra else 0) for worker in range(num_workers)]
     
     def optimize(self):
         """Run the ant colony optimization algorithm"""
+        num_workers = max(1, min(self.NUM_WORKERS, self.NUM_ANTS))
+        if num_workers == 1:
+            return self._optimize(None, 1)
+        
+        # Share one pheromone buffer with the workers instead of pickling it per ant;
+        # workers only read it while the parent updates it between iterations
+        memory = shared_memory.SharedMemory(create=True, size=max(self.pheromones.nbytes, 1))
+        try:
+            shared = np.ndarray(self.pheromones.shape, dtype=self.pheromones.dtype, buffer=memory.buf)
+            shared[...] = self.pheromones
+            self.pheromones = shared
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=num_workers,
+                initializer=_init_ant_worker,
+                initargs=(self, memory.name, shared.shape, shared.dtype.str)
+            ) as executor:
+                best_solution = self._optimize(executor, num_workers)
+            self.pheromones = shared.copy()
+            del shared
+        finally:
+            memory.close()
+            memory.unlink()
+        
+        return best_solution
+    
+    def _optimize(self, executor, num_workers):
+        """Iterate construction, evaluation and pheromone update"""
         best_solution = None
         best_score = 0
         best_metrics = None
+        entropy = np.random.SeedSequence(self.SEED).entropy
+        ants_per_worker = self._split_ants(num_workers)
+        deadline = time.time() + self.TIME_LIMIT if self.TIME_LIMIT else None
+        self.timer.lap('init')
         
-        print("Starting ACO optimization...")
+        print(f"Starting ACO optimization with {num_workers} worker(s)...")
         
         for iteration in range(self.MAX_ITERATIONS):
-            # Construct solutions with all ants
+            self.timer.count('iterations')
+            
+            # Construct solutions with all ants, each worker on its own random stream
             solutions = []
-            for _ in range(self.NUM_ANTS):
-                solutions.append(self._construct_solution())
+            if executor is None:
+                rng = self._ant_rng(entropy, iteration, 0)
+                for _ in range(self.NUM_ANTS):
+                    solutions.append(self._construct_solution(rng))
+            else:
+                futures = [
+                    executor.submit(_construct_ants, self._ant_rng(entropy, iteration, worker), num_ants)
+                    for worker, num_ants in enumerate(ants_per_worker)
+                ]
+                for future in futures:
+                    solutions.extend(future.result())
             
             # Evaluate solutions
             scores = []
@@ -338,57 +243,75 @@ class AntColonyScheduler:
                 best_solution = iter_best_solution
                 best_score = iter_best_score
                 best_metrics = iter_best_metrics
+                self.timer.count('improvements')
                 print(f"Iteration {iteration}: New best score: {best_score}")
                 print(f"Metrics: {best_metrics}")
             
             # Update pheromones
             self._update_pheromones(solutions, scores)
+            
+            if self.progress:
+                self.progress.report(iteration, best_score, best_metrics['teacher_conflicts'], best_metrics['section_conflicts'])
+            
+            # Stop once the time budget is spent
+            if deadline and time.time() >= deadline:
+                print(f"Time limit of {self.TIME_LIMIT}s reached after iteration {iteration}. Stopping.")
+                break
         
+        self.timer.lap('search')
         print(f"ACO optimization completed. Final best score: {best_score}")
         print(f"Final metrics: {best_metrics}")
         
+        if self.progress and best_metrics:
+            # Iterations actually run, which is fewer after a time-limit stop
+            self.progress.report(iteration + 1, best_score, best_metrics['teacher_conflicts'], best_metrics['section_conflicts'], force=True)
+        
         return best_solution
     
-    def create_schedules(self):
-        """Run the optimization and save results to the database"""
-        # Start timing
-        start_time = time.time()
-        
-        # Run the ant colony optimization
+    def solve(self):
+        """Run the ant colony optimization and return the best schedule with its metrics"""
         best_schedule = self.optimize()
         
         # Get metrics for the best schedule
         _, metrics = self._evaluate_solution(best_schedule)
+        metrics['pheromone_memory_bytes'] = self.pheromones.nbytes
+        self.timer.lap('evaluate')
         
-        # Save the schedule to the database
-        count = 0
-        for entry in best_schedule:
-            # Check if this combination already exists
-            existing = self.session.query(self.Schedule).filter_by(
-                day=entry['day'],
-                time_slot=entry['time_slot'],
-                teacher_id=entry['teacher_id'],
-                section_id=entry['section_id'],
-                subject_id=entry['subject_id']
-            ).first()
-            
-            if not existing:
-                new_schedule = self.Schedule(
-                    day=entry['day'],
-                    time_slot=entry['time_slot'],
-                    teacher_id=entry['teacher_id'],
-                    section_id=entry['section_id'],
-                    subject_id=entry['subject_id']
-                )
-                self.session.add(new_schedule)
-                count += 1
-        
-        # Calculate execution time
-        execution_time = time.time() - start_time
-        
-        return count, metrics, execution_time
+        return best_schedule, metrics
+
+class AntState:
+    """Partial solution of one ant with its busy slots and teacher loads"""
+    
+    __slots__ = ('problem', 'solution', 'teacher_busy', 'section_busy', 'loads')
+    
+    def __init__(self, problem):
+        self.problem = problem
+        self.solution = ScheduleSolution(array('i', [-1] * problem.num_genes), array('i', [-1] * problem.num_genes))
+        self.teacher_busy = np.zeros((problem.num_teachers, problem.num_slots), dtype=bool)
+        self.section_busy = np.zeros((problem.num_sections, problem.num_slots), dtype=bool)
+        self.loads = np.zeros(problem.num_teachers, dtype=np.int64)
+    
+    def assign(self, gene, slot, teacher):
+        """Record a gene's assignment and mark its teacher and section busy"""
+        self.solution.slots[gene] = slot
+        self.solution.teachers[gene] = teacher
+        self.teacher_busy[teacher, slot] = True
+        self.section_busy[self.problem.gene_section[gene], slot] = True
+        self.loads[teacher] += 1
+
+# Per-process state of pool workers, set once by _init_ant_worker
+_worker_scheduler = None
+_worker_memory = None
+
+def _init_ant_worker(scheduler, memory_name, shape, dtype):
+    """Attach a worker process to the shared pheromone buffer"""
+    global _worker_scheduler, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    pheromones = np.ndarray(shape, dtype=np.dtype(dtype), buffer=_worker_memory.buf)
+    pheromones.flags.writeable = False
+    scheduler.pheromones = pheromones
+    _worker_scheduler = scheduler
 
-def create_ant_colony_schedule(session, Section, Subject, Teacher, Schedule):
-    """Function to be called from the route handler"""
-    scheduler = AntColonyScheduler(session, Section, Subject, Teacher, Schedule)
-    return scheduler.create_schedules()
+def _construct_ants(rng, num_ants):
+    """Build num_ants solutions in a worker process"""
+    return [_worker_scheduler._construct_solution(rng) for _ in range(num_ants)]
@@ -1,194 +1,131 @@
 import random
 import time
-from collections import defaultdict
+from .schedule_problem import OccupancyIndex
+from .timing import PhaseTimer
 
 class HillClimbingScheduler:
-    def __init__(self, session, Section, Subject, Teacher, Schedule):
-        self.session = session
-        self.Section = Section
-        self.Subject = Subject
-        self.Teacher = Teacher
-        self.Schedule = Schedule
-        
+    def __init__(self, problem, progress=None, timer=None):
         # Constants for the hill climbing algorithm
-        self.MAX_ITERATIONS = 1000
-        self.MAX_NEIGHBORS = 100
-        self.NO_IMPROVEMENT_LIMIT = 50
-        
-        # Load data from database
-        self.teachers = session.query(Teacher).all()
-        self.sections = session.query(Section).all()
-        self.subjects = session.query(Subject).all()
-        
-        # Time slots and days
-        self.time_slots = ["7:30-8:30", "8:30-9:30", "9:30-10:30", "10:30-11:30", 
-                          "1:00-2:00", "2:00-3:00", "3:00-4:00", "4:00-5:00"]
-        self.days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-        
-        # Create mappings for quick reference
-        self.teacher_subjects = self._map_teacher_subjects()
-        
-    def _map_teacher_subjects(self):
-        """Map teachers to their subjects based on the subject_id relationship"""
-        teacher_subjects = defaultdict(list)
-        for teacher in self.teachers:
-            # Add the directly assigned subject
-            teacher_subjects[teacher.id].append(teacher.subject_id)
-        
-        return teacher_subjects
+        # Neighbors are scored incrementally in O(1), so the limits can be generous
+        self.MAX_ITERATIONS = 20000
+        self.MAX_NEIGHBORS = 200
+        self.NO_IMPROVEMENT_LIMIT = 500
+        
+        # Stop the search after TIME_LIMIT seconds and keep the best so far (None = no limit)
+        self.TIME_LIMIT = None
+        
+        # Optional ProgressReporter fed once per iteration
+        self.progress = progress
+        
+        # PhaseTimer charged with the init, search and evaluate phases and the run counters
+        self.timer = timer if timer is not None else PhaseTimer()
+        
+        # Integer-indexed problem model shared by all schedulers; built from
+        # the database by scripts.orm or from a plain dict with ScheduleProblem.from_dict
+        self.problem = problem
+        self.days = self.problem.days
+        self.time_slots = self.problem.time_slots
     
     def _create_initial_schedule(self):
         """Create an initial random schedule"""
-        schedule = []
-        
-        # Create a schedule for each section and required subject
-        for section in self.sections:
-            for subject in self.subjects:
-                # Skip if section doesn't need this subject (implement your own logic)
-                if hasattr(section, 'grade_level') and not self._section_needs_subject(section, subject):
-                    continue
-                
-                # Find suitable teachers for this subject
-                suitable_teachers = [teacher.id for teacher in self.teachers 
-                                    if subject.id in self.teacher_subjects[teacher.id]]
-                
-                if not suitable_teachers:
-                    suitable_teachers = [teacher.id for teacher in self.teachers]
-                
-                # Randomly select day, time, and teacher
-                day = random.choice(self.days)
-                time_slot = random.choice(self.time_slots)
-                teacher_id = random.choice(suitable_teachers)
-                
-                # Add to schedule
-                schedule.append({
-                    'day': day,
-                    'time_slot': time_slot,
-                    'teacher_id': teacher_id,
-                    'section_id': section.id,
-                    'subject_id': subject.id
-                })
-        
-        return schedule
-    
-    def _section_needs_subject(self, section, subject):
-        """Determine if a section needs a particular subject"""
-        # Implement logic based on your requirements
-        return True  # Default: assume all sections need all subjects
+        return self.problem.random_solution()
     
     def _calculate_score(self, schedule):
         """Calculate a score for the schedule (higher is better)"""
-        # 1. Teacher conflicts (lower is better)
-        teacher_slots = defaultdict(int)
-        for entry in schedule:
-            key = (entry['teacher_id'], entry['day'], entry['time_slot'])
-            teacher_slots[key] += 1
-        
-        teacher_conflicts = sum(count - 1 for count in teacher_slots.values() if count > 1)
-        
-        # 2. Section conflicts (lower is better)
-        section_slots = defaultdict(int)
-        for entry in schedule:
-            key = (entry['section_id'], entry['day'], entry['time_slot'])
-            section_slots[key] += 1
-        
-        section_conflicts = sum(count - 1 for count in section_slots.values() if count > 1)
-        
-        # 3. Teacher load balance (lower is better)
-        teacher_loads = defaultdict(int)
-        for entry in schedule:
-            teacher_loads[entry['teacher_id']] += 1
-        
-        avg_load = sum(teacher_loads.values()) / max(len(teacher_loads), 1)
-        load_variance = sum((load - avg_load) ** 2 for load in teacher_loads.values()) / max(len(teacher_loads), 1)
-        
-        # 4. Teacher-subject suitability (higher is better)
-        suitability = 0
-        for entry in schedule:
-            if entry['subject_id'] in self.teacher_subjects[entry['teacher_id']]:
-                suitability += 1
+        metrics = self.problem.evaluate(schedule)
+        score = self._weighted_score(
+            metrics['teacher_conflicts'],
+            metrics['section_conflicts'],
+            metrics['load_variance'],
+            metrics['suitability']
+        )
         
+        return score, metrics
+    
+    def _weighted_score(self, teacher_conflicts, section_conflicts, load_variance, suitability):
+        """Combine the objective counts into a single score"""
         # Combined score (higher is better)
-        score = (
+        return (
             -10 * teacher_conflicts
             -10 * section_conflicts
             -2 * load_variance
             +1 * suitability
         )
-        
-        return score, {
-            'teacher_conflicts': teacher_conflicts,
-            'section_conflicts': section_conflicts,
-            'load_variance': load_variance,
-            'suitability': suitability
-        }
     
-    def _get_neighbor(self, schedule):
-        """Generate a neighboring schedule by making a small change"""
-        neighbor = schedule.copy()
+    def _get_neighbor_move(self, schedule):
+        """Pick a small change as a (gene, slot, teacher) move without copying the schedule"""
+        problem = self.problem
         
         # Select a random entry to modify
-        idx = random.randint(0, len(neighbor) - 1)
-        entry = neighbor[idx].copy()  # Create a copy to avoid modifying the original
+        idx = random.randint(0, len(schedule) - 1)
+        slot = schedule.slots[idx]
+        teacher = schedule.teachers[idx]
         
         # Choose what to modify (day, time_slot, or teacher)
         modification = random.choice(['day', 'time_slot', 'teacher_id'])
         
         if modification == 'day':
-            entry['day'] = random.choice(self.days)
+            slot = problem.random_day_change(slot)
         elif modification == 'time_slot':
-            entry['time_slot'] = random.choice(self.time_slots)
+            slot = problem.random_time_change(slot)
         else:  # teacher_id
-            suitable_teachers = [teacher.id for teacher in self.teachers 
-                                if entry['subject_id'] in self.teacher_subjects[teacher.id]]
-            
-            if not suitable_teachers:
-                suitable_teachers = [teacher.id for teacher in self.teachers]
-            
-            entry['teacher_id'] = random.choice(suitable_teachers)
+            teacher = random.choice(problem.gene_teachers[idx])
         
-        # Replace the modified entry
-        neighbor[idx] = entry
-        
-        return neighbor
+        return idx, slot, teacher
     
     def climb(self):
         """Execute hill climbing algorithm to find an optimized schedule"""
         # Generate initial solution
         current_schedule = self._create_initial_schedule()
-        current_score, metrics = self._calculate_score(current_schedule)
+        
+        # Occupancy counters let each neighbor be scored from the single changed gene
+        occupancy = OccupancyIndex(self.problem, current_schedule)
+        current_score = self._weighted_score(*occupancy.counts())
         
         print(f"Initial schedule score: {current_score}")
-        print(f"Initial metrics: {metrics}")
+        print(f"Initial metrics: {occupancy.metrics()}")
         
         iteration = 0
         no_improvement_count = 0
+        deadline = time.time() + self.TIME_LIMIT if self.TIME_LIMIT else None
+        self.timer.lap('init')
         
         while iteration < self.MAX_ITERATIONS and no_improvement_count < self.NO_IMPROVEMENT_LIMIT:
-            # Generate neighbors
-            best_neighbor = None
+            # Score neighbors as moves; only the accepted one is applied
+            best_move = None
             best_neighbor_score = float('-inf')
             
             for _ in range(self.MAX_NEIGHBORS):
-                neighbor = self._get_neighbor(current_schedule)
-                neighbor_score, _ = self._calculate_score(neighbor)
+                move = self._get_neighbor_move(current_schedule)
+                neighbor_score = self._weighted_score(*occupancy.move_counts(*move))
                 
                 if neighbor_score > best_neighbor_score:
-                    best_neighbor = neighbor
+                    best_move = move
                     best_neighbor_score = neighbor_score
             
             # If best neighbor is better than current, move to it
             if best_neighbor_score > current_score:
-                current_schedule = best_neighbor
+                occupancy.assign(*best_move)
+                self.timer.count('moves_accepted')
                 current_score = best_neighbor_score
-                _, metrics = self._calculate_score(current_schedule)
                 print(f"Iteration {iteration}: Found better schedule with score {current_score}")
-                print(f"Metrics: {metrics}")
+                print(f"Metrics: {occupancy.metrics()}")
                 no_improvement_count = 0
             else:
                 no_improvement_count += 1
             
+            if self.progress:
+                self.progress.report(iteration, current_score, occupancy.teacher_conflicts, occupancy.section_conflicts)
+            
             iteration += 1
+            
+            # Stop once the time budget is spent
+            if deadline and time.time() >= deadline:
+                print(f"Time limit of {self.TIME_LIMIT}s reached after {iteration} iterations. Stopping.")
+                break
+        
+        self.timer.lap('search')
+        self.timer.count('iterations', iteration)
         
         final_score, final_metrics = self._calculate_score(current_schedule)
         print(f"Final schedule score: {final_score}")
@@ -196,48 +133,17 @@ class HillClimbingScheduler:
         print(f"Total iterations: {iteration}")
         print(f"Stopped after {no_improvement_count} iterations without improvement")
         
+        if self.progress:
+            self.progress.report(iteration, final_score, final_metrics['teacher_conflicts'], final_metrics['section_conflicts'], force=True)
+        
         return current_schedule
     
-    def create_schedules(self):
-        """Run the hill climbing algorithm and save results to the database"""
-        # Start timing
-        start_time = time.time()
-        
-        # Run the hill climbing algorithm
+    def solve(self):
+        """Run the hill climbing and return the best schedule with its metrics"""
         best_schedule = self.climb()
         
         # Get metrics for the best schedule
         _, metrics = self._calculate_score(best_schedule)
+        self.timer.lap('evaluate')
         
-        # Save the schedule to the database
-        count = 0
-        for entry in best_schedule:
-            # Check if this combination already exists
-            existing = self.session.query(self.Schedule).filter_by(
-                day=entry['day'],
-                time_slot=entry['time_slot'],
-                teacher_id=entry['teacher_id'],
-                section_id=entry['section_id'],
-                subject_id=entry['subject_id']
-            ).first()
-            
-            if not existing:
-                new_schedule = self.Schedule(
-                    day=entry['day'],
-                    time_slot=entry['time_slot'],
-                    teacher_id=entry['teacher_id'],
-                    section_id=entry['section_id'],
-                    subject_id=entry['subject_id']
-                )
-                self.session.add(new_schedule)
-                count += 1
-        
-        # Calculate execution time
-        execution_time = time.time() - start_time
-        
-        return count, metrics, execution_time
-
-def create_hill_climbing_schedule(session, Section, Subject, Teacher, Schedule):
-    """Function to be called from the route handler"""
-    scheduler = HillClimbingScheduler(session, Section, Subject, Teacher, Schedule)
-    return scheduler.create_schedules()
+        return best_schedule, metrics
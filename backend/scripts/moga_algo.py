@@ -1,17 +1,13 @@
+import os
 import random
 import numpy as np
 import time
-from collections import defaultdict
 import concurrent.futures
+from .schedule_problem import OccupancyIndex
+from .timing import PhaseTimer
 
 class MOGAScheduler:
-    def __init__(self, session, Section, Subject, Teacher, Schedule):
-        self.session = session
-        self.Section = Section
-        self.Subject = Subject
-        self.Teacher = Teacher
-        self.Schedule = Schedule
-        
+    def __init__(self, problem, num_islands=None, seed=None, progress=None, timer=None):
         # Constants for the genetic algorithm - modified for better performance
         self.POPULATION_SIZE = 100  # Increased population size
         self.GENERATIONS = 200  # Increased max generations
@@ -20,124 +16,67 @@ class MOGAScheduler:
         self.CROSSOVER_RATE = 0.9  # Increased crossover rate
         self.ELITISM_COUNT = 5  # Keep top solutions
         self.EARLY_STOP_GENERATIONS = 20  # Stop if no improvement after these generations
-        
-        # Load data from database
-        self.teachers = session.query(Teacher).all()
-        self.sections = session.query(Section).all()
-        self.subjects = session.query(Subject).all()
-        
-        # Time slots and days
-        self.time_slots = ["7:30-8:30", "8:30-9:30", "9:30-10:30", "10:30-11:30", 
-                          "1:00-2:00", "2:00-3:00", "3:00-4:00", "4:00-5:00"]
-        self.days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-        
-        # Create mappings for quick reference
-        self.teacher_subjects = self._map_teacher_subjects()
-        
-    def _map_teacher_subjects(self):
-        """Map teachers to their subjects based on the subject_id relationship"""
-        teacher_subjects = defaultdict(list)
-        for teacher in self.teachers:
-            # Add the directly assigned subject
-            teacher_subjects[teacher.id].append(teacher.subject_id)
-        
-        return teacher_subjects
+        self.VECTORIZED_FITNESS = True  # Score the population as one NumPy batch
+        
+        # Island model: NUM_ISLANDS populations evolve in separate processes and
+        # exchange their best MIGRATION_SIZE chromosomes every MIGRATION_INTERVAL
+        # generations along MIGRATION_TOPOLOGY ('ring', 'fully_connected' or 'random')
+        self.NUM_ISLANDS = num_islands if num_islands is not None else int(os.getenv('MOGA_ISLANDS', '1'))
+        self.MIGRATION_INTERVAL = 10
+        self.MIGRATION_TOPOLOGY = 'ring'
+        self.MIGRATION_SIZE = 2
+        self.SEED = seed
+        
+        # Stop the search after TIME_LIMIT seconds and keep the best so far (None = no limit)
+        self.TIME_LIMIT = None
+        
+        # Optional ProgressReporter fed once per generation
+        self.progress = progress
+        
+        # PhaseTimer charged with the init, search and evaluate phases and the run counters
+        self.timer = timer if timer is not None else PhaseTimer()
+        
+        # Integer-indexed problem model shared by all schedulers; built from
+        # the database by scripts.orm or from a plain dict with ScheduleProblem.from_dict
+        self.problem = problem
+        self.days = self.problem.days
+        self.time_slots = self.problem.time_slots
     
     def _create_random_schedule(self):
         """Create a random schedule (chromosome)"""
-        chromosome = []
-        
-        # Create a schedule for each section and required subject
-        for section in self.sections:
-            for subject in self.subjects:
-                # Skip if section doesn't need this subject
-                if hasattr(section, 'grade_level') and not self._section_needs_subject(section, subject):
-                    continue
-                
-                # Find suitable teachers for this subject
-                suitable_teachers = [teacher.id for teacher in self.teachers 
-                                    if subject.id in self.teacher_subjects[teacher.id]]
-                
-                if not suitable_teachers:
-                    suitable_teachers = [teacher.id for teacher in self.teachers]
-                
-                # Randomly select day, time, and teacher
-                day = random.choice(self.days)
-                time_slot = random.choice(self.time_slots)
-                teacher_id = random.choice(suitable_teachers)
-                
-                # Add to chromosome
-                chromosome.append({
-                    'day': day,
-                    'time_slot': time_slot,
-                    'teacher_id': teacher_id,
-                    'section_id': section.id,
-                    'subject_id': subject.id
-                })
-        
-        return chromosome
+        return self.problem.random_solution()
     
-    def _section_needs_subject(self, section, subject):
-        """Determine if a section needs a particular subject"""
-        # Implement logic based on your requirements
-        # For example, check if subject is appropriate for section's grade level
-        return True  # Default: assume all sections need all subjects
+    def __getstate__(self):
+        """Drop the progress reporter and timer when shipped to island worker processes"""
+        state = self.__dict__.copy()
+        for key in ('progress', 'timer'):
+            state.pop(key, None)
+        return state
     
     def _calculate_fitness(self, chromosome):
         """Calculate fitness scores for multiple objectives"""
-        # 1. Teacher conflicts (lower is better)
-        teacher_slots = defaultdict(int)
-        for gene in chromosome:
-            key = (gene['teacher_id'], gene['day'], gene['time_slot'])
-            teacher_slots[key] += 1
-        
-        teacher_conflicts = sum(count - 1 for count in teacher_slots.values() if count > 1)
-        
-        # 2. Section conflicts (lower is better)
-        section_slots = defaultdict(int)
-        for gene in chromosome:
-            key = (gene['section_id'], gene['day'], gene['time_slot'])
-            section_slots[key] += 1
-        
-        section_conflicts = sum(count - 1 for count in section_slots.values() if count > 1)
-        
-        # 3. Teacher load balance (lower is better)
-        teacher_loads = defaultdict(int)
-        for gene in chromosome:
-            teacher_loads[gene['teacher_id']] += 1
-        
-        avg_load = sum(teacher_loads.values()) / max(len(teacher_loads), 1)
-        load_variance = sum((load - avg_load) ** 2 for load in teacher_loads.values()) / max(len(teacher_loads), 1)
-        
-        # 4. Teacher-subject suitability (higher is better)
-        suitability = 0
-        for gene in chromosome:
-            if gene['subject_id'] in self.teacher_subjects[gene['teacher_id']]:
-                suitability += 1
-        
+        metrics = self.problem.evaluate(chromosome)
+        return self._weighted_fitness(metrics), metrics
+    
+    def _weighted_fitness(self, metrics):
+        """Combine the objective counts into a single fitness value"""
         # Combined fitness (weighted sum, needs to be maximized)
         # Higher penalties for conflicts to eliminate them entirely
-        fitness = (
-            -50 * teacher_conflicts  # Significantly increased penalty
-            -50 * section_conflicts  # Significantly increased penalty
-            -2 * load_variance
-            +1 * suitability
+        return (
+            -50 * metrics['teacher_conflicts']  # Significantly increased penalty
+            -50 * metrics['section_conflicts']  # Significantly increased penalty
+            -2 * metrics['load_variance']
+            +1 * metrics['suitability']
         )
-        
-        return fitness, {
-            'teacher_conflicts': teacher_conflicts,
-            'section_conflicts': section_conflicts,
-            'load_variance': load_variance,
-            'suitability': suitability
-        }
     
     def _calculate_population_fitness(self, population):
-        """Calculate fitness for entire population with parallel processing"""
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            results = list(executor.map(self._calculate_fitness, population))
+        """Calculate fitness for entire population, batched through NumPy by default"""
+        if not self.VECTORIZED_FITNESS:
+            results = [self._calculate_fitness(chromosome) for chromosome in population]
+            return [result[0] for result in results], [result[1] for result in results]
         
-        fitnesses = [result[0] for result in results]
-        metrics_list = [result[1] for result in results]
+        metrics_list = self.problem.evaluate_population(population)
+        fitnesses = [self._weighted_fitness(metrics) for metrics in metrics_list]
         return fitnesses, metrics_list
     
     def _selection(self, population, fitnesses):
@@ -165,17 +104,15 @@ class MOGAScheduler:
     
     def _crossover(self, parent1, parent2):
         """Perform crossover between two parents"""
-        if random.random() > self.CROSSOVER_RATE:
-            return parent1, parent2
+        if random.random() > self.CROSSOVER_RATE or len(parent1) < 2:
+            # Copy so mutation never touches the parents (or the elites)
+            return parent1.copy(), parent2.copy()
         
         # Find crossover point
         crossover_point = random.randint(1, len(parent1) - 1)
         
         # Create children by swapping parts of parents
-        child1 = parent1[:crossover_point] + parent2[crossover_point:]
-        child2 = parent2[:crossover_point] + parent1[crossover_point:]
-        
-        return child1, child2
+        return parent1.crossover(parent2, crossover_point)
     
     def _adaptive_mutation(self, chromosome, generation, max_generations, current_best_fitness):
         """Adaptive mutation rate based on generation and fitness"""
@@ -190,63 +127,87 @@ class MOGAScheduler:
         mutation_rate = self.INITIAL_MUTATION_RATE * (1 - progress_factor * 0.5) + fitness_factor
         mutation_rate = max(mutation_rate, self.MIN_MUTATION_RATE)
         
+        problem = self.problem
+        slots = chromosome.slots
+        teachers = chromosome.teachers
+        
+        # Occupancy counts make the per-gene conflict check O(1); built lazily
+        occupancy = None
+        
         for i in range(len(chromosome)):
             if random.random() < mutation_rate:
-                gene = chromosome[i]
+                if occupancy is None:
+                    occupancy = OccupancyIndex(problem, chromosome)
+                slot = slots[i]
+                teacher = teachers[i]
                 
                 # Determine what to mutate based on conflicts
-                day_time_conflicts = True  # Assume there might be conflicts
-                teacher_conflicts = False
-                
-                # Check if this gene contributes to a conflict
-                for j in range(len(chromosome)):
-                    if i != j:
-                        if (gene['day'] == chromosome[j]['day'] and 
-                            gene['time_slot'] == chromosome[j]['time_slot']):
-                            if gene['teacher_id'] == chromosome[j]['teacher_id']:
-                                teacher_conflicts = True
-                            if gene['section_id'] == chromosome[j]['section_id']:
-                                day_time_conflicts = True
+                teacher_conflicts = occupancy.teacher_busy(teacher, slot) > 1
+                day_time_conflicts = occupancy.section_busy(problem.gene_section[i], slot) > 1
                 
                 # Targeted mutation based on conflict type
                 if teacher_conflicts:
                     # Change teacher to resolve conflict
-                    suitable_teachers = [teacher.id for teacher in self.teachers 
-                                        if gene['subject_id'] in self.teacher_subjects[teacher.id]]
-                    
-                    if not suitable_teachers:
-                        suitable_teachers = [teacher.id for teacher in self.teachers]
-                    
-                    gene['teacher_id'] = random.choice(suitable_teachers)
+                    teacher = random.choice(problem.gene_teachers[i])
                 
                 elif day_time_conflicts:
                     # Change time or day to resolve conflict
-                    if random.random() < 0.5:
-                        gene['day'] = random.choice(self.days)
-                    else:
-                        gene['time_slot'] = random.choice(self.time_slots)
+                    slot = problem.random_slot_change(slot)
                 
                 else:
                     # Random mutation if no specific conflicts
                     mutation_type = random.choice(['day', 'time_slot', 'teacher_id'])
                     
                     if mutation_type == 'day':
-                        gene['day'] = random.choice(self.days)
+                        slot = problem.random_day_change(slot)
                     elif mutation_type == 'time_slot':
-                        gene['time_slot'] = random.choice(self.time_slots)
+                        slot = problem.random_time_change(slot)
                     else:  # teacher_id
-                        suitable_teachers = [teacher.id for teacher in self.teachers 
-                                            if gene['subject_id'] in self.teacher_subjects[teacher.id]]
-                        
-                        if not suitable_teachers:
-                            suitable_teachers = [teacher.id for teacher in self.teachers]
-                        
-                        gene['teacher_id'] = random.choice(suitable_teachers)
+                        teacher = random.choice(problem.gene_teachers[i])
+                
+                # Keep the counts in step with the changed gene
+                occupancy.assign(i, slot, teacher)
         
         return chromosome
     
+    def _next_generation(self, population, fitnesses, generation, best_fitness):
+        """Breed and evaluate the next generation of a population"""
+        # Selection
+        selected = self._selection(population, fitnesses)
+        
+        # Create new population through crossover and mutation
+        new_population = []
+        
+        # Ensure elites are preserved
+        sorted_indices = sorted(range(len(fitnesses)), key=lambda i: fitnesses[i], reverse=True)
+        for i in range(self.ELITISM_COUNT):
+            new_population.append(population[sorted_indices[i]])
+        
+        # Add offspring through crossover and mutation
+        while len(new_population) < self.POPULATION_SIZE:
+            parent1, parent2 = random.sample(selected, 2)
+            child1, child2 = self._crossover(parent1, parent2)
+            
+            child1 = self._adaptive_mutation(child1, generation, self.GENERATIONS, best_fitness)
+            child2 = self._adaptive_mutation(child2, generation, self.GENERATIONS, best_fitness)
+            
+            new_population.append(child1)
+            if len(new_population) < self.POPULATION_SIZE:
+                new_population.append(child2)
+        
+        # Ensure population size remains the same
+        new_population = new_population[:self.POPULATION_SIZE]
+        
+        # Calculate fitness for new population
+        new_fitnesses, new_metrics_list = self._calculate_population_fitness(new_population)
+        
+        return new_population, new_fitnesses, new_metrics_list
+    
     def evolve(self):
         """Run the MOGA algorithm and return the best schedule"""
+        if self.NUM_ISLANDS > 1:
+            return self._evolve_islands()
+        
         # Create initial population
         population = [self._create_random_schedule() for _ in range(self.POPULATION_SIZE)]
         
@@ -263,37 +224,16 @@ class MOGAScheduler:
         
         # Track generations without improvement for early stopping
         generations_without_improvement = 0
+        generation = -1
+        deadline = time.time() + self.TIME_LIMIT if self.TIME_LIMIT else None
+        self.timer.lap('init')
         
         # Evolution loop
         for generation in range(self.GENERATIONS):
-            # Selection
-            selected = self._selection(population, fitnesses)
-            
-            # Create new population through crossover and mutation
-            new_population = []
-            
-            # Ensure elites are preserved
-            sorted_indices = sorted(range(len(fitnesses)), key=lambda i: fitnesses[i], reverse=True)
-            for i in range(self.ELITISM_COUNT):
-                new_population.append(population[sorted_indices[i]])
-            
-            # Add offspring through crossover and mutation
-            while len(new_population) < self.POPULATION_SIZE:
-                parent1, parent2 = random.sample(selected, 2)
-                child1, child2 = self._crossover(parent1, parent2)
-                
-                child1 = self._adaptive_mutation(child1, generation, self.GENERATIONS, best_fitness)
-                child2 = self._adaptive_mutation(child2, generation, self.GENERATIONS, best_fitness)
-                
-                new_population.append(child1)
-                if len(new_population) < self.POPULATION_SIZE:
-                    new_population.append(child2)
-            
-            # Ensure population size remains the same
-            new_population = new_population[:self.POPULATION_SIZE]
-            
-            # Calculate fitness for new population
-            new_fitnesses, new_metrics_list = self._calculate_population_fitness(new_population)
+            self.timer.count('generations')
+            new_population, new_fitnesses, new_metrics_list = self._next_generation(
+                population, fitnesses, generation, best_fitness
+            )
             
             # Find the best in current generation
             curr_best_idx = new_fitnesses.index(max(new_fitnesses))
@@ -303,6 +243,7 @@ class MOGAScheduler:
                 best_fitness = curr_best_fitness
                 best_chromosome = new_population[curr_best_idx]
                 best_metrics = new_metrics_list[curr_best_idx]
+                self.timer.count('improvements')
                 print(f"Generation {generation}: New best fitness: {best_fitness}")
                 print(f"Metrics: {best_metrics}")
                 generations_without_improvement = 0
@@ -313,6 +254,9 @@ class MOGAScheduler:
             population = new_population
             fitnesses = new_fitnesses
             
+            if self.progress:
+                self.progress.report(generation, best_fitness, best_metrics['teacher_conflicts'], best_metrics['section_conflicts'])
+            
             # Early stopping if perfect solution found (no conflicts)
             if best_metrics['teacher_conflicts'] == 0 and best_metrics['section_conflicts'] == 0:
                 print(f"Perfect solution found at generation {generation}! Early stopping.")
@@ -322,52 +266,198 @@ class MOGAScheduler:
             if generations_without_improvement >= self.EARLY_STOP_GENERATIONS:
                 print(f"No improvement for {self.EARLY_STOP_GENERATIONS} generations. Early stopping.")
                 break
+            
+            # Stop once the time budget is spent
+            if deadline and time.time() >= deadline:
+                print(f"Time limit of {self.TIME_LIMIT}s reached after generation {generation}. Stopping.")
+                break
         
+        self.timer.lap('search')
         print(f"Final best fitness: {best_fitness}")
         print(f"Final metrics: {best_metrics}")
         
+        if self.progress:
+            # Generations actually run, which is fewer after an early stop
+            self.progress.report(generation + 1, best_fitness, best_metrics['teacher_conflicts'], best_metrics['section_conflicts'], force=True)
+        
         return best_chromosome
     
-    def create_schedules(self):
-        """Run the algorithm and save results to the database"""
-        # Start timing
-        start_time = time.time()
+    def _evolve_island(self, island, first_generation, num_generations):
+        """Evolve one island for a number of generations (runs in a worker process)
+
+        Returns the island and the number of generations it actually ran.
+        """
+        if island is None:
+            population = [self._create_random_schedule() for _ in range(self.POPULATION_SIZE)]
+            fitnesses, metrics_list = self._calculate_population_fitness(population)
+        else:
+            population, fitnesses, metrics_list = island
+        
+        generations_run = 0
+        for generation in range(first_generation, first_generation + num_generations):
+            population, fitnesses, metrics_list = self._next_generation(
+                population, fitnesses, generation, max(fitnesses)
+            )
+            generations_run += 1
+            
+            # Stop the epoch early once this island holds a conflict-free schedule
+            if any(metrics['teacher_conflicts'] == 0 and metrics['section_conflicts'] == 0
+                   for metrics in metrics_list):
+                break
+        
+        return (population, fitnesses, metrics_list), generations_run
+    
+    def _island_seed(self, entropy, generation, island):
+        """Independent seed for one island epoch"""
+        return int(np.random.SeedSequence(entropy, spawn_key=(generation, island)).generate_state(1)[0])
+    
+    def _migration_targets(self, source, num_islands, rng):
+        """Islands that receive the elites of the source island"""
+        others = [island for island in range(num_islands) if island != source]
+        if self.MIGRATION_TOPOLOGY == 'ring':
+            return [(source + 1) % num_islands]
+        if self.MIGRATION_TOPOLOGY == 'fully_connected':
+            return others
+        if self.MIGRATION_TOPOLOGY == 'random':
+            return [rng.choice(others)]
+        raise ValueError(f"Unknown migration topology: {self.MIGRATION_TOPOLOGY}")
+    
+    def _migrate(self, islands, rng):
+        """Copy each island's elites over the worst individuals of its destination islands"""
+        incoming = [[] for _ in islands]
+        for source, (population, fitnesses, metrics_list) in enumerate(islands):
+            elites = sorted(range(len(fitnesses)), key=lambda i: fitnesses[i], reverse=True)[:self.MIGRATION_SIZE]
+            for destination in self._migration_targets(source, len(islands), rng):
+                incoming[destination].extend(
+                    (population[i].copy(), fitnesses[i], metrics_list[i]) for i in elites
+                )
+        
+        for (population, fitnesses, metrics_list), migrants in zip(islands, incoming):
+            worst = sorted(range(len(fitnesses)), key=lambda i: fitnesses[i])
+            for i, (chromosome, fitness, metrics) in zip(worst, migrants[:len(population) - self.ELITISM_COUNT]):
+                population[i] = chromosome
+                fitnesses[i] = fitness
+                metrics_list[i] = metrics
+    
+    def _evolve_islands(self):
+        """Run NUM_ISLANDS populations in worker processes with periodic migration"""
+        num_islands = self.NUM_ISLANDS
+        seed_sequence = np.random.SeedSequence(self.SEED)
+        migration_rng = random.Random(int(seed_sequence.generate_state(1)[0]))
+        islands = [None] * num_islands
+        
+        best_fitness = float('-inf')
+        best_chromosome = None
+        best_metrics = None
+        generations_without_improvement = 0
+        generation = 0
+        deadline = time.time() + self.TIME_LIMIT if self.TIME_LIMIT else None
+        self.timer.lap('init')
+        
+        print(f"Starting island MOGA: {num_islands} islands, {self.MIGRATION_TOPOLOGY} migration every {self.MIGRATION_INTERVAL} generations")
+        
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=num_islands,
+            initializer=_init_moga_worker,
+            initargs=(self,)
+        ) as executor:
+            while generation < self.GENERATIONS:
+                epoch = min(self.MIGRATION_INTERVAL, self.GENERATIONS - generation)
+                
+                # Each island gets its own random stream per epoch
+                futures = [
+                    executor.submit(
+                        _evolve_island_epoch, island, generation, epoch,
+                        self._island_seed(seed_sequence.entropy, generation, index)
+                    )
+                    for index, island in enumerate(islands)
+                ]
+                results = [future.result() for future in futures]
+                islands = [island for island, _, _ in results]
+                
+                # Islands score their populations in the workers; add their
+                # evaluations to this process's problem counter
+                self.problem.evaluations += sum(evaluations for _, _, evaluations in results)
+                
+                # An island stops its epoch early once it is conflict-free;
+                # count the generations of the island that ran longest
+                generations_run = max(generations_run for _, generations_run, _ in results)
+                generation += generations_run
+                self.timer.count('generations', generations_run)
+                
+                # Track the best chromosome across all islands
+                improved = False
+                for population, fitnesses, metrics_list in islands:
+                    island_best_idx = fitnesses.index(max(fitnesses))
+                    if fitnesses[island_best_idx] > best_fitness:
+                        best_fitness = fitnesses[island_best_idx]
+                        best_chromosome = population[island_best_idx]
+                        best_metrics = metrics_list[island_best_idx]
+                        improved = True
+                
+                if improved:
+                    self.timer.count('improvements')
+                    print(f"Generation {generation}: New best fitness: {best_fitness}")
+                    print(f"Metrics: {best_metrics}")
+                    generations_without_improvement = 0
+                else:
+                    generations_without_improvement += generations_run
+                
+                if self.progress:
+                    self.progress.report(generation, best_fitness, best_metrics['teacher_conflicts'], best_metrics['section_conflicts'])
+                
+                # Early stopping if perfect solution found (no conflicts)
+                if best_metrics['teacher_conflicts'] == 0 and best_metrics['section_conflicts'] == 0:
+                    print(f"Perfect solution found by generation {generation}! Early stopping.")
+                    break
+                
+                # Early stopping if no improvement for many generations
+                if generations_without_improvement >= self.EARLY_STOP_GENERATIONS:
+                    print(f"No improvement for {self.EARLY_STOP_GENERATIONS} generations. Early stopping.")
+                    break
+                
+                # Stop once the time budget is spent
+                if deadline and time.time() >= deadline:
+                    print(f"Time limit of {self.TIME_LIMIT}s reached after generation {generation}. Stopping.")
+                    break
+                
+                self._migrate(islands, migration_rng)
+        
+        self.timer.lap('search')
+        print(f"Final best fitness: {best_fitness}")
+        print(f"Final metrics: {best_metrics}")
         
-        # Run the MOGA algorithm
+        if self.progress:
+            # generation already counts the generations the islands ran
+            self.progress.report(generation, best_fitness, best_metrics['teacher_conflicts'], best_metrics['section_conflicts'], force=True)
+        
+        return best_chromosome
+    
+    def solve(self):
+        """Run the MOGA algorithm and return the best schedule with its metrics"""
         best_schedule = self.evolve()
         
         # Get metrics for the best schedule
         _, metrics = self._calculate_fitness(best_schedule)
+        self.timer.lap('evaluate')
         
-        # Save the schedule to the database
-        count = 0
-        for entry in best_schedule:
-            # Check if this combination already exists
-            existing = self.session.query(self.Schedule).filter_by(
-                day=entry['day'],
-                time_slot=entry['time_slot'],
-                teacher_id=entry['teacher_id'],
-                section_id=entry['section_id'],
-                subject_id=entry['subject_id']
-            ).first()
-            
-            if not existing:
-                new_schedule = self.Schedule(
-                    day=entry['day'],
-                    time_slot=entry['time_slot'],
-                    teacher_id=entry['teacher_id'],
-                    section_id=entry['section_id'],
-                    subject_id=entry['subject_id']
-                )
-                self.session.add(new_schedule)
-                count += 1
-        
-        # Calculate execution time
-        execution_time = time.time() - start_time
-        
-        return count, metrics, execution_time
+        return best_schedule, metrics
+
+# Scheduler copy held by each island worker process, set by _init_moga_worker
+_worker_scheduler = None
+
+def _init_moga_worker(scheduler):
+    """Keep the scheduler in the worker so it is pickled once per process"""
+    global _worker_scheduler
+    _worker_scheduler = scheduler
+
+def _evolve_island_epoch(island, first_generation, num_generations, seed):
+    """Evolve one island between two migrations in a worker process
 
-def create_moga_schedule(session, Section, Subject, Teacher, Schedule):
-    """Function to be called from the route handler"""
-    scheduler = MOGAScheduler(session, Section, Subject, Teacher, Schedule)
-    return scheduler.create_schedules()
+    Returns the island, the generations it ran and the evaluations it made.
+    """
+    random.seed(seed)
+    problem = _worker_scheduler.problem
+    evaluations_before = problem.evaluations
+    island, generations_run = _worker_scheduler._evolve_island(island, first_generation, num_generations)
+    return island, generations_run, problem.evaluations - evaluations_before
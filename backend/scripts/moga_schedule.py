@@ -1,4 +1,4 @@
-from .moga_algo import create_moga_schedule
+from .orm import create_moga_schedule
 
 # This file simply re-exports the function to maintain compatibility
 # with the existing routes
@@ -0,0 +1,75 @@
+import time
+from .schedule_problem import ScheduleProblem
+from .persistence import save_schedules
+from .solver import solve
+from .timing import PhaseTimer
+
+
+def section_needs_subject(section, subject):
+    """Determine if a section needs a particular subject"""
+    # Implement custom logic here if needed
+    return True  # Default: assume all sections need all subjects
+
+
+def load_problem(session, Section, Subject, Teacher):
+    """Load teachers, sections and subjects into a ScheduleProblem"""
+    return ScheduleProblem.from_models(
+        session.query(Teacher).all(),
+        session.query(Section).all(),
+        session.query(Subject).all(),
+        section_needs_subject
+    )
+
+
+def solve_and_save(algorithm, session, Section, Subject, Teacher, Schedule, clear_existing=False, timer=None, **options):
+    """Load the problem from the database, solve it and save the schedule
+
+    options are passed to solver.solve(). Old schedules are cleared only
+    once the search is done, so the write lock is not held while the solver
+    runs. Nothing is committed here. The metrics gain the load, init,
+    search, evaluate and persist phase durations ("phases") and the run
+    counters ("counters"). Returns (count, metrics, execution_time).
+    """
+    start_time = time.time()
+    timer = timer if timer is not None else PhaseTimer()
+    problem = load_problem(session, Section, Subject, Teacher)
+    timer.lap('load')
+    result = solve(problem, algorithm, timer=timer, **options)
+    count = save_schedules(session, Schedule, result['schedules'], clear_existing=clear_existing)
+    session.flush()
+    timer.lap('persist')
+
+    metrics = dict(result['metrics'], phases=timer.phase_seconds(), counters=dict(timer.counters))
+    return count, metrics, time.time() - start_time
+
+
+def create_moga_schedule(session, Section, Subject, Teacher, Schedule, num_islands=None, seed=None, progress=None, clear_existing=False, timer=None):
+    """Function to be called from the route handler"""
+    return solve_and_save(
+        'moga', session, Section, Subject, Teacher, Schedule,
+        clear_existing=clear_existing, timer=timer, seed=seed, workers=num_islands, progress=progress
+    )
+
+
+def create_hill_climbing_schedule(session, Section, Subject, Teacher, Schedule, progress=None, clear_existing=False, timer=None):
+    """Function to be called from the route handler"""
+    return solve_and_save(
+        'hill-climbing', session, Section, Subject, Teacher, Schedule,
+        clear_existing=clear_existing, timer=timer, progress=progress
+    )
+
+
+def create_simple_genetic_schedule(session, Section, Subject, Teacher, Schedule, progress=None, clear_existing=False, timer=None):
+    """Function to be called from the route handler"""
+    return solve_and_save(
+        'simple-genetic', session, Section, Subject, Teacher, Schedule,
+        clear_existing=clear_existing, timer=timer, progress=progress
+    )
+
+
+def create_ant_colony_schedule(session, Section, Subject, Teacher, Schedule, num_workers=None, seed=None, progress=None, clear_existing=False, timer=None):
+    """Function to be called from the route handler"""
+    return solve_and_save(
+        'ant-colony', session, Section, Subject, Teacher, Schedule,
+        clear_existing=clear_existing, timer=timer, seed=seed, workers=num_workers, progress=progress
+    )
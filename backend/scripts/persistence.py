@@ -0,0 +1,49 @@
+from sqlalchemy import insert
+from models import DataVersion
+
+# Columns that identify one timetable entry
+SCHEDULE_KEY = ('day', 'time_slot', 'teacher_id', 'section_id', 'subject_id')
+
+# Section ids per existence query; every id is a bound variable, and SQLite
+# caps them per statement (999 before 3.32)
+SECTION_ID_CHUNK = 500
+
+
+def save_schedules(session, Schedule, entries, clear_existing=False):
+    """Insert decoded entries that are not stored yet and return how many were added
+
+    Existing rows are fetched with one query per SECTION_ID_CHUNK sections
+    being written, and the new rows go out as a single executemany of plain mappings, so no
+    ORM object is built per entry. The data version is bumped in the same
+    transaction; nothing is committed here.
+    """
+    if clear_existing:
+        session.query(Schedule).delete()
+        existing = set()
+    else:
+        section_ids = sorted({entry['section_id'] for entry in entries})
+        columns = [getattr(Schedule, name) for name in SCHEDULE_KEY]
+        existing = set()
+        for start in range(0, len(section_ids), SECTION_ID_CHUNK):
+            chunk = section_ids[start:start + SECTION_ID_CHUNK]
+            existing.update(
+                tuple(row) for row in session.query(*columns).filter(Schedule.section_id.in_(chunk))
+            )
+
+    rows = []
+    for entry in entries:
+        key = tuple(entry[name] for name in SCHEDULE_KEY)
+        # Duplicates inside the batch are skipped like already stored rows
+        if key in existing:
+            continue
+        existing.add(key)
+        rows.append(dict(zip(SCHEDULE_KEY, key)))
+
+    if rows:
+        session.execute(insert(Schedule), rows)
+
+    # Cached read responses are invalidated when this transaction commits
+    if rows or clear_existing:
+        DataVersion.bump(session)
+
+    return len(rows)
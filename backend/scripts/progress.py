@@ -0,0 +1,32 @@
+import time
+
+
+class ProgressReporter:
+    """Rate-limited progress callback for the solver loops.
+
+    Schedulers call report() once per generation or iteration; anything
+    closer than min_interval seconds to the previous emission is dropped
+    after a single clock read, so the hot loop pays almost nothing.
+    """
+
+    def __init__(self, callback, algorithm, min_interval=0.5):
+        self.callback = callback
+        self.algorithm = algorithm
+        self.min_interval = min_interval
+        self.start_time = time.monotonic()
+        self.last_emit = float('-inf')
+
+    def report(self, step, best_score, teacher_conflicts, section_conflicts, force=False):
+        """Emit step, best score and conflict counts unless rate-limited"""
+        now = time.monotonic()
+        if not force and now - self.last_emit < self.min_interval:
+            return
+        self.last_emit = now
+        self.callback({
+            'algorithm': self.algorithm,
+            'step': step,
+            'best_score': best_score,
+            'teacher_conflicts': teacher_conflicts,
+            'section_conflicts': section_conflicts,
+            'elapsed_seconds': round(now - self.start_time, 3)
+        })
@@ -0,0 +1,36 @@
+import importlib
+from functools import partial
+
+# The one table of algorithms: name -> (module, scheduler class, keyword for
+# its worker count or None). solver.solve() runs the classes and generation
+# jobs go through orm.solve_and_save(). Nothing is imported until an
+# algorithm is first used, so processes that only serve reads never load NumPy.
+SCHEDULERS = {
+    'moga': ('scripts.moga_algo', 'MOGAScheduler', 'num_islands'),
+    'hill-climbing': ('scripts.hill_climbing', 'HillClimbingScheduler', None),
+    'simple-genetic': ('scripts.simple_genetic', 'SimpleGeneticScheduler', None),
+    'ant-colony': ('scripts.ant_colony', 'AntColonyScheduler', 'num_workers'),
+}
+
+_classes = {}
+
+
+def _check(algorithm):
+    if algorithm not in SCHEDULERS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+
+
+def get_scheduler_class(algorithm):
+    """Return the scheduler class of an algorithm, importing its module on first use"""
+    if algorithm not in _classes:
+        _check(algorithm)
+        module_name, class_name, _ = SCHEDULERS[algorithm]
+        _classes[algorithm] = getattr(importlib.import_module(module_name), class_name)
+    return _classes[algorithm]
+
+
+def get_solver(algorithm):
+    """Return a create_*_schedule style function for an algorithm, importing the solver stack on first use"""
+    _check(algorithm)
+    from scripts.orm import solve_and_save
+    return partial(solve_and_save, algorithm)
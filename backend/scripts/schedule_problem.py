@@ -0,0 +1,422 @@
+import random
+from array import array
+import numpy as np
+from .timetable import TIME_SLOTS, DAYS
+
+
+class ScheduleProblem:
+    """Integer-indexed description of a scheduling problem.
+
+    Teachers, sections and subjects are addressed by dense indices (0..n-1)
+    instead of database ids, and every (day, time_slot) pair is folded into a
+    single slot index ``day_index * num_time_slots + time_index``. Gene ``g``
+    is the g-th required section-subject pair; a solution only has to store a
+    slot and a teacher index per gene.
+    """
+
+    def __init__(self, teachers, section_ids, subject_ids, pairs, days=None, time_slots=None):
+        """
+        teachers:    list of (teacher_id, subject_ids) tuples
+        section_ids: list of section ids
+        subject_ids: list of subject ids
+        pairs:       list of required (section_id, subject_id) tuples
+        """
+        self.days = list(days or DAYS)
+        self.time_slots = list(time_slots or TIME_SLOTS)
+        self.num_days = len(self.days)
+        self.num_time_slots = len(self.time_slots)
+        self.num_slots = self.num_days * self.num_time_slots
+
+        # Dense index <-> database id mappings
+        self.teacher_ids = [teacher_id for teacher_id, _ in teachers]
+        self.section_ids = list(section_ids)
+        self.subject_ids = list(subject_ids)
+        self.teacher_index = {teacher_id: i for i, teacher_id in enumerate(self.teacher_ids)}
+        self.section_index = {section_id: i for i, section_id in enumerate(self.section_ids)}
+        self.subject_index = {subject_id: i for i, subject_id in enumerate(self.subject_ids)}
+        self.num_teachers = len(self.teacher_ids)
+        self.num_sections = len(self.section_ids)
+        self.num_subjects = len(self.subject_ids)
+
+        # Flat teacher x subject suitability table
+        self.suitable = bytearray(self.num_teachers * self.num_subjects)
+        for t, (_, teacher_subject_ids) in enumerate(teachers):
+            for subject_id in teacher_subject_ids:
+                s = self.subject_index.get(subject_id)
+                if s is not None:
+                    self.suitable[t * self.num_subjects + s] = 1
+
+        # Gene columns: the section and subject of each gene never change
+        self.gene_section = array('i', [self.section_index[section_id] for section_id, _ in pairs])
+        self.gene_subject = array('i', [self.subject_index[subject_id] for _, subject_id in pairs])
+        self.num_genes = len(self.gene_section)
+
+        # Candidate teachers per subject, falling back to every teacher
+        all_teachers = tuple(range(self.num_teachers))
+        subject_teachers = []
+        for s in range(self.num_subjects):
+            candidates = tuple(t for t in all_teachers if self.suitable[t * self.num_subjects + s])
+            subject_teachers.append(candidates or all_teachers)
+        self.subject_teachers = subject_teachers
+        self.gene_teachers = [subject_teachers[s] for s in self.gene_subject]
+
+        # Solutions and moves scored so far, for evaluations/sec reporting
+        self.evaluations = 0
+
+    @classmethod
+    def from_models(cls, teachers, sections, subjects, section_needs_subject=None, days=None, time_slots=None):
+        """Build a problem from loaded Teacher, Section and Subject rows"""
+        pairs = [
+            (section.id, subject.id)
+            for section in sections
+            for subject in subjects
+            if section_needs_subject is None or section_needs_subject(section, subject)
+        ]
+        return cls(
+            [(teacher.id, [teacher.subject_id]) for teacher in teachers],
+            [section.id for section in sections],
+            [subject.id for subject in subjects],
+            pairs,
+            days=days,
+            time_slots=time_slots,
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a problem from a plain, JSON-compatible description
+
+        data has ``teachers`` ({'id', 'subject_id'} or {'id', 'subject_ids'}),
+        ``sections`` and ``subjects`` ({'id', ...}) lists. Optional keys are
+        ``pairs`` ([section_id, subject_id] lists, every section x subject by
+        default), ``days`` and ``time_slots``. Extra keys such as names are
+        ignored, so benchmark instances and exported databases load as is.
+        """
+        section_ids = [section['id'] for section in data['sections']]
+        subject_ids = [subject['id'] for subject in data['subjects']]
+        pairs = data.get('pairs')
+        if pairs is None:
+            pairs = [(section_id, subject_id) for section_id in section_ids for subject_id in subject_ids]
+        return cls(
+            [
+                (teacher['id'], teacher['subject_ids'] if 'subject_ids' in teacher else [teacher['subject_id']])
+                for teacher in data['teachers']
+            ],
+            section_ids,
+            subject_ids,
+            [tuple(pair) for pair in pairs],
+            days=data.get('days'),
+            time_slots=data.get('time_slots'),
+        )
+
+    def is_suitable(self, teacher, subject):
+        """Whether teacher index can teach subject index"""
+        return self.suitable[teacher * self.num_subjects + subject] == 1
+
+    def random_solution(self, rng=random):
+        """Create a solution with a random slot and candidate teacher per gene"""
+        num_slots = self.num_slots
+        return ScheduleSolution(
+            array('i', [rng.randrange(num_slots) for _ in range(self.num_genes)]),
+            array('i', [rng.choice(candidates) for candidates in self.gene_teachers]),
+        )
+
+    def random_day_change(self, slot, rng=random):
+        """Move a slot to a random day, keeping its time"""
+        return rng.randrange(self.num_days) * self.num_time_slots + slot % self.num_time_slots
+
+    def random_time_change(self, slot, rng=random):
+        """Move a slot to a random time, keeping its day"""
+        return slot - slot % self.num_time_slots + rng.randrange(self.num_time_slots)
+
+    def random_slot_change(self, slot, rng=random):
+        """Change either the day or the time of a slot"""
+        if rng.random() < 0.5:
+            return self.random_day_change(slot, rng)
+        return self.random_time_change(slot, rng)
+
+    def evaluate(self, solution):
+        """Count conflicts, load variance and suitability of a solution"""
+        self.evaluations += 1
+        num_slots = self.num_slots
+        slots = solution.slots
+        teachers = solution.teachers
+        num_genes = self.num_genes
+
+        # Conflicts are the genes that share an occupied (owner, slot) cell
+        teacher_conflicts = num_genes - len({t * num_slots + slot for t, slot in zip(teachers, slots)})
+        section_conflicts = num_genes - len({s * num_slots + slot for s, slot in zip(self.gene_section, slots)})
+
+        # Variance of the load over teachers that appear in the solution
+        loads = [0] * self.num_teachers
+        for t in teachers:
+            loads[t] += 1
+        loads = [load for load in loads if load]
+        count = max(len(loads), 1)
+        avg_load = sum(loads) / count
+        load_variance = sum((load - avg_load) ** 2 for load in loads) / count
+
+        num_subjects = self.num_subjects
+        suitable = self.suitable
+        suitability = sum(suitable[t * num_subjects + s] for t, s in zip(teachers, self.gene_subject))
+
+        return {
+            'teacher_conflicts': teacher_conflicts,
+            'section_conflicts': section_conflicts,
+            'load_variance': load_variance,
+            'suitability': suitability
+        }
+
+    def evaluate_population(self, population):
+        """Score a whole population at once.
+
+        The population is stacked into two (population x genes) int matrices
+        and every count is a single bincount over row-offset keys, so the cost
+        is a handful of NumPy calls instead of a Python loop per chromosome.
+        Returns one metrics dict per individual, identical to evaluate().
+        """
+        size = len(population)
+        if size == 0:
+            return []
+        self.evaluations += size
+        slots = np.array([np.frombuffer(solution.slots, dtype=np.intc) for solution in population], dtype=np.int64)
+        teachers = np.array([np.frombuffer(solution.teachers, dtype=np.intc) for solution in population], dtype=np.int64)
+        num_genes = self.num_genes
+        rows = np.arange(size, dtype=np.int64)[:, None]
+
+        # Conflicts: genes minus distinct occupied (owner, slot) cells per row
+        teacher_cells = self.num_teachers * self.num_slots
+        teacher_counts = np.bincount(
+            (rows * teacher_cells + teachers * self.num_slots + slots).ravel(),
+            minlength=size * teacher_cells
+        ).reshape(size, teacher_cells)
+        teacher_conflicts = num_genes - np.count_nonzero(teacher_counts, axis=1)
+
+        section_cells = self.num_sections * self.num_slots
+        gene_section = np.frombuffer(self.gene_section, dtype=np.intc).astype(np.int64)
+        section_counts = np.bincount(
+            (rows * section_cells + gene_section * self.num_slots + slots).ravel(),
+            minlength=size * section_cells
+        ).reshape(size, section_cells)
+        section_conflicts = num_genes - np.count_nonzero(section_counts, axis=1)
+
+        # Load variance over the teachers used by each individual
+        loads = np.bincount(
+            (rows * self.num_teachers + teachers).ravel(),
+            minlength=size * self.num_teachers
+        ).reshape(size, self.num_teachers)
+        used = loads > 0
+        used_count = np.maximum(used.sum(axis=1), 1)
+        avg_load = loads.sum(axis=1) / used_count
+        load_variance = (((loads - avg_load[:, None]) ** 2) * used).sum(axis=1) / used_count
+
+        # Suitability through the flat teacher x subject table
+        suitable = np.frombuffer(bytes(self.suitable), dtype=np.uint8)
+        gene_subject = np.frombuffer(self.gene_subject, dtype=np.intc).astype(np.int64)
+        suitability = suitable[teachers * self.num_subjects + gene_subject].sum(axis=1, dtype=np.int64)
+
+        return [
+            {
+                'teacher_conflicts': tc,
+                'section_conflicts': sc,
+                'load_variance': lv,
+                'suitability': su
+            }
+            for tc, sc, lv, su in zip(
+                teacher_conflicts.tolist(), section_conflicts.tolist(),
+                load_variance.tolist(), suitability.tolist()
+            )
+        ]
+
+    def decode(self, solution):
+        """Translate a solution back into schedule entries with database ids"""
+        entries = []
+        nts = self.num_time_slots
+        for g in range(self.num_genes):
+            slot = solution.slots[g]
+            entries.append({
+                'day': self.days[slot // nts],
+                'time_slot': self.time_slots[slot % nts],
+                'teacher_id': self.teacher_ids[solution.teachers[g]],
+                'section_id': self.section_ids[self.gene_section[g]],
+                'subject_id': self.subject_ids[self.gene_subject[g]]
+            })
+        return entries
+
+
+class ScheduleSolution:
+    """Array-backed schedule: one slot index and one teacher index per gene"""
+
+    __slots__ = ('slots', 'teachers')
+
+    def __init__(self, slots, teachers):
+        self.slots = slots
+        self.teachers = teachers
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __eq__(self, other):
+        if not isinstance(other, ScheduleSolution):
+            return NotImplemented
+        return self.slots == other.slots and self.teachers == other.teachers
+
+    __hash__ = None
+
+    def copy(self):
+        return ScheduleSolution(array('i', self.slots), array('i', self.teachers))
+
+    def crossover(self, other, point):
+        """One-point crossover returning two new children"""
+        return (
+            ScheduleSolution(self.slots[:point] + other.slots[point:],
+                             self.teachers[:point] + other.teachers[point:]),
+            ScheduleSolution(other.slots[:point] + self.slots[point:],
+                             other.teachers[:point] + self.teachers[point:]),
+        )
+
+
+class OccupancyIndex:
+    """Occupancy counters for one solution, kept up to date move by move.
+
+    Tracks how many genes sit in every teacher x slot and section x slot cell
+    plus the load of each teacher, so conflicts, load variance and suitability
+    of the solution (or of a single-gene move) are available in O(1). Genes
+    whose slot is -1 are treated as unassigned and are not counted.
+    """
+
+    def __init__(self, problem, solution):
+        self.problem = problem
+        self.solution = solution
+        self.teacher_slots = [0] * (problem.num_teachers * problem.num_slots)
+        self.section_slots = [0] * (problem.num_sections * problem.num_slots)
+        self.loads = [0] * problem.num_teachers
+        self.teacher_conflicts = 0
+        self.section_conflicts = 0
+        self.suitability = 0
+        self.assigned = 0
+        self.used_teachers = 0
+        self.load_squares = 0
+
+        for gene in range(problem.num_genes):
+            if solution.slots[gene] >= 0:
+                self._add(gene, solution.slots[gene], solution.teachers[gene])
+
+    def _add(self, gene, slot, teacher):
+        problem = self.problem
+        cell = teacher * problem.num_slots + slot
+        if self.teacher_slots[cell]:
+            self.teacher_conflicts += 1
+        self.teacher_slots[cell] += 1
+
+        cell = problem.gene_section[gene] * problem.num_slots + slot
+        if self.section_slots[cell]:
+            self.section_conflicts += 1
+        self.section_slots[cell] += 1
+
+        load = self.loads[teacher]
+        if not load:
+            self.used_teachers += 1
+        self.load_squares += 2 * load + 1
+        self.loads[teacher] = load + 1
+        self.assigned += 1
+        self.suitability += problem.suitable[teacher * problem.num_subjects + problem.gene_subject[gene]]
+
+    def _remove(self, gene, slot, teacher):
+        problem = self.problem
+        cell = teacher * problem.num_slots + slot
+        self.teacher_slots[cell] -= 1
+        if self.teacher_slots[cell]:
+            self.teacher_conflicts -= 1
+
+        cell = problem.gene_section[gene] * problem.num_slots + slot
+        self.section_slots[cell] -= 1
+        if self.section_slots[cell]:
+            self.section_conflicts -= 1
+
+        load = self.loads[teacher] - 1
+        if not load:
+            self.used_teachers -= 1
+        self.load_squares -= 2 * load + 1
+        self.loads[teacher] = load
+        self.assigned -= 1
+        self.suitability -= problem.suitable[teacher * problem.num_subjects + problem.gene_subject[gene]]
+
+    def assign(self, gene, slot, teacher):
+        """Place gene at (slot, teacher), replacing any previous assignment"""
+        solution = self.solution
+        if solution.slots[gene] >= 0:
+            self._remove(gene, solution.slots[gene], solution.teachers[gene])
+        solution.slots[gene] = slot
+        solution.teachers[gene] = teacher
+        self._add(gene, slot, teacher)
+
+    def teacher_busy(self, teacher, slot):
+        """Number of genes the teacher already has in slot"""
+        return self.teacher_slots[teacher * self.problem.num_slots + slot]
+
+    def section_busy(self, section, slot):
+        """Number of genes the section already has in slot"""
+        return self.section_slots[section * self.problem.num_slots + slot]
+
+    def load_variance(self):
+        used = self.used_teachers
+        if not used:
+            return 0.0
+        avg_load = self.assigned / used
+        return max(self.load_squares / used - avg_load * avg_load, 0.0)
+
+    def counts(self):
+        """(teacher_conflicts, section_conflicts, load_variance, suitability) of the solution"""
+        return self.teacher_conflicts, self.section_conflicts, self.load_variance(), self.suitability
+
+    def metrics(self):
+        teacher_conflicts, section_conflicts, load_variance, suitability = self.counts()
+        return {
+            'teacher_conflicts': teacher_conflicts,
+            'section_conflicts': section_conflicts,
+            'load_variance': load_variance,
+            'suitability': suitability
+        }
+
+    def move_counts(self, gene, slot, teacher):
+        """Counts the solution would have after moving an assigned gene, without moving it"""
+        problem = self.problem
+        problem.evaluations += 1
+        num_slots = problem.num_slots
+        old_slot = self.solution.slots[gene]
+        old_teacher = self.solution.teachers[gene]
+        teacher_conflicts = self.teacher_conflicts
+        section_conflicts = self.section_conflicts
+        suitability = self.suitability
+
+        if slot != old_slot or teacher != old_teacher:
+            if self.teacher_slots[old_teacher * num_slots + old_slot] > 1:
+                teacher_conflicts -= 1
+            if self.teacher_slots[teacher * num_slots + slot]:
+                teacher_conflicts += 1
+
+        if slot != old_slot:
+            section = problem.gene_section[gene]
+            if self.section_slots[section * num_slots + old_slot] > 1:
+                section_conflicts -= 1
+            if self.section_slots[section * num_slots + slot]:
+                section_conflicts += 1
+
+        used = self.used_teachers
+        load_squares = self.load_squares
+        if teacher != old_teacher:
+            old_load = self.loads[old_teacher]
+            new_load = self.loads[teacher]
+            if old_load == 1:
+                used -= 1
+            if not new_load:
+                used += 1
+            load_squares += 2 * (new_load - old_load) + 2
+
+            subject = problem.gene_subject[gene]
+            suitability += (problem.suitable[teacher * problem.num_subjects + subject]
+                            - problem.suitable[old_teacher * problem.num_subjects + subject])
+
+        avg_load = self.assigned / used
+        load_variance = max(load_squares / used - avg_load * avg_load, 0.0)
+        return teacher_conflicts, section_conflicts, load_variance, suitability
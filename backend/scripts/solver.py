@@ -0,0 +1,56 @@
+import time
+import random
+from .timing import PhaseTimer
+from .registry import SCHEDULERS, get_scheduler_class
+
+
+def solve(problem, algorithm, seed=None, workers=None, time_limit=None, progress=None, constants=None, timer=None):
+    """Run one algorithm on a ScheduleProblem; no database or Flask involved
+
+    seed makes the run reproducible, workers is the island or ant worker
+    process count for the algorithms that have one, time_limit stops the
+    search after that many seconds with the best schedule so far (checked
+    once per generation or iteration), and constants overrides
+    scheduler settings such as GENERATIONS (names the algorithm does not
+    have are skipped). A PhaseTimer passed as timer is charged with the
+    init, search and evaluate phases. Returns a dict with the best solution,
+    its decoded schedule entries, metrics, the applied constants, the number
+    of evaluations, phase durations, run counters and the execution time in
+    seconds.
+    """
+    scheduler_class = get_scheduler_class(algorithm)
+    workers_keyword = SCHEDULERS[algorithm][2]
+
+    timer = timer if timer is not None else PhaseTimer()
+    options = {'progress': progress, 'timer': timer}
+    if workers_keyword:
+        options[workers_keyword] = workers
+        options['seed'] = seed
+    if seed is not None:
+        random.seed(seed)
+
+    start_time = time.time()
+    scheduler = scheduler_class(problem, **options)
+    scheduler.TIME_LIMIT = time_limit
+    applied = {}
+    for name, value in (constants or {}).items():
+        if hasattr(scheduler, name):
+            setattr(scheduler, name, value)
+            applied[name] = value
+
+    evaluations_before = problem.evaluations
+    solution, metrics = scheduler.solve()
+    execution_time = time.time() - start_time
+    timer.count('evaluations', problem.evaluations - evaluations_before)
+
+    return {
+        'algorithm': algorithm,
+        'solution': solution,
+        'schedules': problem.decode(solution),
+        'metrics': metrics,
+        'constants': applied,
+        'evaluations': timer.counters['evaluations'],
+        'phases': timer.phase_seconds(),
+        'counters': dict(timer.counters),
+        'execution_time': execution_time,
+    }
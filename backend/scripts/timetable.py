@@ -0,0 +1,5 @@
+# Time slots and days shared by every scheduler. Kept free of heavy imports so
+# the web process can use them without loading the solvers or NumPy.
+TIME_SLOTS = ["7:30-8:30", "8:30-9:30", "9:30-10:30", "10:30-11:30",
+              "1:00-2:00", "2:00-3:00", "3:00-4:00", "4:00-5:00"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
@@ -0,0 +1,40 @@
+import time
+
+# Phases of one generation run, in the order they happen
+PHASES = ('load', 'init', 'search', 'evaluate', 'persist', 'commit')
+
+
+class PhaseTimer:
+    """Lap timer splitting a generation run into phases, plus run counters.
+
+    Each lap() charges the time since the previous lap to a phase, so the
+    code being timed only needs one call at the end of each phase instead of
+    being wrapped in a block. Counters hold totals such as evaluations,
+    generations or moves accepted.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+        self.last_lap = time.perf_counter()
+
+    def lap(self, phase):
+        """Charge the time since the previous lap to phase"""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self.last_lap
+        self.last_lap = now
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def phase_seconds(self):
+        """Phase durations rounded for responses, in PHASES order"""
+        ordered = [phase for phase in PHASES if phase in self.phases]
+        ordered += [phase for phase in self.phases if phase not in PHASES]
+        return {phase: round(self.phases[phase], 4) for phase in ordered}
+
+    def summary(self):
+        """One log line with every phase and counter"""
+        phases = ', '.join(f"{phase} {seconds:.3f}s" for phase, seconds in self.phase_seconds().items())
+        counters = ', '.join(f"{name} {value}" for name, value in self.counters.items())
+        return f"{phases} | {counters}" if counters else phases
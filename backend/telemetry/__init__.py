@@ -0,0 +1,5 @@
+from .registry import Registry
+from .metrics import REGISTRY, GENERATIONS_IN_FLIGHT, record_generation
+from .instrument import init_request_metrics
+
+__all__ = ['Registry', 'REGISTRY', 'GENERATIONS_IN_FLIGHT', 'record_generation', 'init_request_metrics']
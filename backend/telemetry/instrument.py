@@ -0,0 +1,37 @@
+import time
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from .metrics import REQUEST_LATENCY, REQUEST_RESPONSES, REQUEST_DB_QUERIES
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    """Count statements run on behalf of the current request"""
+    if has_request_context():
+        g.db_queries = g.get('db_queries', 0) + 1
+
+
+def _start_request():
+    g.request_started = time.perf_counter()
+    g.db_queries = 0
+
+
+def _finish_request(response):
+    """Observe latency, status and query count once the response is ready"""
+    started = g.get('request_started')
+    if started is None:
+        return response
+
+    # Label by the route pattern, not the URL, so ids do not create new series
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    blueprint = request.blueprint or ''
+    REQUEST_LATENCY.labels(blueprint, route, request.method).observe(time.perf_counter() - started)
+    REQUEST_RESPONSES.labels(blueprint, route, request.method, response.status_code).inc()
+    REQUEST_DB_QUERIES.labels(blueprint, route).observe(g.get('db_queries', 0))
+    return response
+
+
+def init_request_metrics(app, engine):
+    """Time every request and count the queries it sends to engine"""
+    event.listen(engine, 'before_cursor_execute', _count_query)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
@@ -0,0 +1,61 @@
+from .registry import Registry
+
+# Every metric of the web process; each process (gunicorn worker) has its own
+REGISTRY = Registry()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    'smartscheduler_http_request_duration_seconds',
+    'Time to produce a response, per blueprint route',
+    ('blueprint', 'route', 'method')
+)
+REQUEST_RESPONSES = REGISTRY.counter(
+    'smartscheduler_http_responses_total',
+    'Responses sent, per blueprint route and status code',
+    ('blueprint', 'route', 'method', 'status')
+)
+REQUEST_DB_QUERIES = REGISTRY.histogram(
+    'smartscheduler_http_request_db_queries',
+    'Database queries executed while handling one request',
+    ('blueprint', 'route'),
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100)
+)
+
+GENERATIONS_IN_FLIGHT = REGISTRY.gauge(
+    'smartscheduler_generation_jobs_in_flight',
+    'Generation jobs handed to the worker pool and not finished yet',
+    ('algorithm',)
+)
+GENERATION_JOBS = REGISTRY.counter(
+    'smartscheduler_generation_jobs_total',
+    'Finished generation jobs by outcome',
+    ('algorithm', 'status')
+)
+SOLVER_DURATION = REGISTRY.histogram(
+    'smartscheduler_solver_duration_seconds',
+    'Solver time (init, search and evaluate phases) of completed generation jobs',
+    ('algorithm',),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+)
+SOLVER_EVALUATIONS = REGISTRY.counter(
+    'smartscheduler_solver_evaluations_total',
+    'Solutions and moves scored by completed generation jobs',
+    ('algorithm',)
+)
+SOLVER_EVALUATIONS_PER_SECOND = REGISTRY.gauge(
+    'smartscheduler_solver_evaluations_per_second',
+    'Evaluations per second of the last completed generation job',
+    ('algorithm',)
+)
+
+
+def record_generation(algorithm, summary):
+    """Record a finished generation job from the summary returned by run_job"""
+    GENERATION_JOBS.labels(algorithm, summary['status']).inc()
+    if summary['status'] != 'completed':
+        return
+
+    solver_seconds = summary['solver_seconds']
+    SOLVER_DURATION.labels(algorithm).observe(solver_seconds)
+    SOLVER_EVALUATIONS.labels(algorithm).inc(summary['evaluations'])
+    if solver_seconds > 0:
+        SOLVER_EVALUATIONS_PER_SECOND.labels(algorithm).set(summary['evaluations'] / solver_seconds)
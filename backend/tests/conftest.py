@@ -0,0 +1,55 @@
+import pytest
+from app import create_app
+from models import db, Teacher, Section, Subject, Schedule, DataVersion
+from routes import caching
+
+
+@pytest.fixture
+def app():
+    """App on a fresh in-memory database"""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'TESTING': True})
+    # Cached bodies are keyed by data version, which restarts with every database
+    caching._body_cache.clear()
+    caching._cache_version = None
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def add_schedules(app):
+    """Insert schedule rows for one teacher and one section, each with its own subject
+
+    Distinct subjects mean any per-row relationship load would show up as
+    extra queries. Returns (teacher_id, section_id).
+    """
+    section = Section(name='Grade 7 - Sunflower')
+    subject = Subject(name='Mathematics', code='MATH')
+    db.session.add_all([section, subject])
+    db.session.flush()
+    teacher = Teacher(name='Michael Tan', subject_id=subject.id)
+    db.session.add(teacher)
+    db.session.commit()
+    teacher_id, section_id = teacher.id, section.id
+
+    def add(count):
+        start = Schedule.query.count()
+        for i in range(start, start + count):
+            subject = Subject(name=f'Subject {i}', code=f'S{i}')
+            db.session.add(subject)
+            db.session.flush()
+            db.session.add(Schedule(day=f'Day {i}', time_slot='7:30-8:30', teacher_id=teacher_id,
+                                    section_id=section_id, subject_id=subject.id))
+        # Writes bump the data version, so cached listing bodies are not reused
+        DataVersion.bump(db.session)
+        db.session.commit()
+        # Later requests must not see objects left in this session's identity map
+        db.session.expunge_all()
+        return teacher_id, section_id
+
+    return add
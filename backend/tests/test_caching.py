@@ -0,0 +1,48 @@
+from models import db, DataVersion
+from routes import caching
+
+
+def test_matching_if_none_match_gets_304(client, add_schedules):
+    add_schedules(3)
+    first = client.get('/schedules/')
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    repeat = client.get('/schedules/', headers={'If-None-Match': first.headers['ETag']})
+
+    assert repeat.status_code == 304
+    assert repeat.headers['ETag'] == first.headers['ETag']
+    assert repeat.get_data() == b''
+
+
+def test_write_bumps_the_version_and_changes_the_etag(client, add_schedules):
+    teacher_id, section_id = add_schedules(1)
+    first = client.get('/schedules/')
+    version = DataVersion.current(db.session)
+
+    created = client.post('/schedules/', json={'day': 'Friday', 'time_slot': '9:30-10:30',
+                                               'teacher_id': teacher_id, 'section_id': section_id})
+    assert created.status_code == 201
+    assert DataVersion.current(db.session) > version
+
+    # The ETag held by the client is stale, so the new body is sent
+    after = client.get('/schedules/', headers={'If-None-Match': first.headers['ETag']})
+
+    assert after.status_code == 200
+    assert after.headers['ETag'] != first.headers['ETag']
+    assert len(after.get_json()['items']) == 2
+
+
+def test_query_strings_are_cached_separately(client, add_schedules):
+    add_schedules(3)
+
+    page = client.get('/schedules/?limit=1').get_json()
+    everything = client.get('/schedules/?limit=3').get_json()
+
+    assert len(page['items']) == 1
+    assert len(everything['items']) == 3
+    assert set(caching._body_cache) == {'/schedules/?limit=1', '/schedules/?limit=3'}
+
+    # Served from the cache, each key still returns its own body
+    assert client.get('/schedules/?limit=1').get_json() == page
+    assert client.get('/schedules/?limit=3').get_json() == everything
@@ -0,0 +1,21 @@
+import sqlite3
+from models import engine
+from cli import MAX_READ_LATENCY_MS, _reads_during_write
+
+# Enough rows that the write stays open for many reads, small enough for the suite
+ROWS = 50000
+
+
+def test_reads_are_not_blocked_by_a_generation_write(tmp_path, monkeypatch):
+    # The environment may pick another journal mode; readers only run alongside the writer in WAL
+    monkeypatch.setattr(engine, 'SQLITE_JOURNAL_MODE', 'WAL')
+    path = tmp_path / 'concurrency.sqlite'
+
+    write_seconds, latencies, errors = _reads_during_write(f"sqlite:///{path}", ROWS)
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert conn.execute('SELECT COUNT(*) FROM schedules').fetchone()[0] == ROWS
+    assert errors == []
+    assert latencies, f"no reads ran during the {write_seconds:.2f}s write"
+    assert max(latencies) * 1000 <= MAX_READ_LATENCY_MS
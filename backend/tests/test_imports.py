@@ -0,0 +1,16 @@
+from cli import (_import_times, WEB_MODULES, SOLVER_ONLY_MODULES, IMPORT_BUDGET_MS,
+                 SOLVER_CORE_MODULES, WEB_STACK_MODULES)
+
+
+def test_web_modules_do_not_import_solvers_and_stay_within_budget():
+    times = _import_times(WEB_MODULES)
+
+    assert [module for module in SOLVER_ONLY_MODULES if module in times] == []
+    total_ms = sum(times.get(module, 0) for module in WEB_MODULES) / 1000
+    assert total_ms <= IMPORT_BUDGET_MS
+
+
+def test_solver_core_does_not_import_the_web_stack():
+    times = _import_times(SOLVER_CORE_MODULES)
+
+    assert [module for module in WEB_STACK_MODULES if module in times] == []
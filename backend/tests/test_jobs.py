@@ -0,0 +1,117 @@
+import os
+import time
+import signal
+import threading
+from datetime import timedelta
+import pytest
+from app import create_app
+from models import db, Teacher, Section, Subject, Schedule, GenerationJob
+from jobs import runner
+from routes import schedules
+
+# Seconds a test waits for a worker before failing
+JOB_TIMEOUT = 120
+
+
+@pytest.fixture
+def job_app(tmp_path):
+    """App on a seeded SQLite file that spawned workers can open too"""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'jobs.sqlite'}", 'TESTING': True})
+    with app.app_context():
+        Subject.seed(db.session)
+        Section.seed(db.session)
+        Teacher.seed(db.session)
+        Subject.seed_section_subject(db.session)
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+    # Pool and status engine are per process; the next test gets new ones
+    if runner._executor is not None:
+        runner._executor.shutdown(wait=True, cancel_futures=True)
+        runner._executor = None
+    if runner._status_engine is not None:
+        runner._status_engine.dispose()
+        runner._status_engine = None
+
+
+def _wait_for(job_id, statuses):
+    """Poll the job row until its status is one of statuses"""
+    deadline = time.monotonic() + JOB_TIMEOUT
+    while time.monotonic() < deadline:
+        db.session.expire_all()
+        job = db.session.get(GenerationJob, job_id)
+        if job.status in statuses:
+            return job
+        time.sleep(0.05)
+    pytest.fail(f"Job {job_id} still {job.status} after {JOB_TIMEOUT}s")
+
+
+def test_submitted_job_completes(job_app):
+    response = job_app.test_client().post('/schedules/generate/hill-climbing', json={})
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+
+    job = _wait_for(job_id, ('completed', 'failed'))
+    assert job.status == 'completed', job.error
+    assert job.count == Schedule.query.count() > 0
+
+    payload = job_app.test_client().get(f'/schedules/jobs/{job_id}').get_json()
+    assert payload['data']['count'] == job.count
+
+
+def test_expired_lease_is_taken_over(job_app):
+    # A running job whose holder died long ago, and one whose holder is alive
+    stale = runner._utcnow() - timedelta(seconds=runner.JOB_LEASE_SECONDS + 1)
+    db.session.add_all([
+        GenerationJob(id='expired', algorithm='hill-climbing', status='running', created_at=stale,
+                      started_at=stale, owner='gone:1', heartbeat_at=stale),
+        GenerationJob(id='leased', algorithm='hill-climbing', status='running', created_at=stale,
+                      started_at=stale, owner='alive:1', heartbeat_at=runner._utcnow()),
+    ])
+    db.session.commit()
+
+    assert runner.recover_expired_jobs() == ['expired']
+
+    job = _wait_for('expired', ('completed', 'failed'))
+    assert job.status == 'completed', job.error
+    assert job.owner not in ('gone:1', runner._owner())
+    assert db.session.get(GenerationJob, 'leased').status == 'running'
+
+
+def test_broken_pool_is_replaced(job_app):
+    client = job_app.test_client()
+    job_id = client.post('/schedules/generate/hill-climbing', json={}).get_json()['job_id']
+    _wait_for(job_id, ('running', 'completed', 'failed'))
+
+    # Kill the worker as the OOM killer would; the whole pool breaks
+    broken = runner._executor
+    for process in list(broken._processes.values()):
+        os.kill(process.pid, signal.SIGKILL)
+
+    # Failed if the worker died running it; a fast job may have finished first
+    job = _wait_for(job_id, ('completed', 'failed'))
+    assert job.status == 'completed' or 'worker process died' in job.error
+
+    next_id = client.post('/schedules/generate/hill-climbing', json={}).get_json()['job_id']
+    job = _wait_for(next_id, ('completed', 'failed'))
+    assert job.status == 'completed', job.error
+    assert runner._executor is not broken
+
+
+def test_progress_streams_are_capped(app, client, monkeypatch):
+    monkeypatch.setattr(schedules, '_sse_slots', threading.BoundedSemaphore(1))
+    db.session.add(GenerationJob(id='done', algorithm='hill-climbing', status='completed', count=0,
+                                 execution_time=0.0, created_at=runner._utcnow()))
+    db.session.commit()
+
+    stream = client.get('/schedules/jobs/done/events', buffered=False)
+    assert stream.status_code == 200
+
+    refused = client.get('/schedules/jobs/done/events')
+    assert refused.status_code == 503
+    assert refused.get_json()['status_url'] == '/schedules/jobs/done'
+
+    # Closing the first stream frees its slot
+    stream.close()
+    assert 'event: completed' in client.get('/schedules/jobs/done/events').get_data(as_text=True)
@@ -0,0 +1,25 @@
+from models import db, Teacher, Section, Subject, Schedule
+from scripts import persistence
+from scripts.persistence import save_schedules
+
+
+def test_existing_rows_are_found_in_every_section_chunk(app, monkeypatch):
+    monkeypatch.setattr(persistence, 'SECTION_ID_CHUNK', 2)
+    subject = Subject(name='Mathematics', code='MATH')
+    sections = [Section(name=f'Grade 7 - {i}') for i in range(5)]
+    db.session.add_all([subject] + sections)
+    db.session.flush()
+    teacher = Teacher(name='Michael Tan', subject_id=subject.id)
+    db.session.add(teacher)
+    db.session.flush()
+
+    def entry(section, day):
+        return {'day': day, 'time_slot': '7:30-8:30', 'teacher_id': teacher.id,
+                'section_id': section.id, 'subject_id': subject.id}
+
+    assert save_schedules(db.session, Schedule, [entry(section, 'Monday') for section in sections]) == 5
+
+    # Monday is stored for every section, in all three chunks; only Tuesday is new
+    entries = [entry(section, day) for section in sections for day in ('Monday', 'Tuesday')]
+    assert save_schedules(db.session, Schedule, entries) == 5
+    assert Schedule.query.count() == 10
@@ -0,0 +1,10 @@
+import pytest
+from cli import INDEXED_QUERIES, SQLITE_SORT_STEP, _query_plan
+
+
+@pytest.mark.parametrize('route, build_query, index_name', INDEXED_QUERIES, ids=[query[0] for query in INDEXED_QUERIES])
+def test_listing_pages_use_an_index_without_sorting(app, route, build_query, index_name):
+    plan = _query_plan(build_query())
+
+    assert index_name in plan
+    assert SQLITE_SORT_STEP not in plan
@@ -0,0 +1,51 @@
+from models import db, Teacher, Section, Subject
+
+
+def _add_timetable(client):
+    """One section and teacher with two lessons, plus a lesson of a section that does not exist"""
+    subject = Subject(name='Mathematics', code='MATH')
+    section = Section(name='Grade 7 - Sunflower')
+    db.session.add_all([subject, section])
+    db.session.flush()
+    teacher = Teacher(name='Michael Tan', subject_id=subject.id)
+    db.session.add(teacher)
+    db.session.commit()
+    ids = {'teacher_id': teacher.id, 'section_id': section.id, 'subject_id': subject.id}
+
+    for time_slot in ('7:30-8:30', '8:30-9:30'):
+        assert client.post('/schedules/', json={'day': 'Monday', 'time_slot': time_slot, **ids}).status_code == 201
+    dangling = dict(ids, section_id=999)
+    assert client.post('/schedules/', json={'day': 'Tuesday', 'time_slot': '7:30-8:30', **dangling}).status_code == 201
+    return ids
+
+
+def test_section_grid_skips_rows_with_a_dangling_section(client):
+    ids = _add_timetable(client)
+
+    response = client.get('/schedules/grid/section')
+    assert response.status_code == 200
+    body = response.get_json()
+
+    assert list(body['grids']) == [str(ids['section_id'])]
+    grid = body['grids'][str(ids['section_id'])]
+    monday = body['days'].index('Monday')
+    assert grid[monday][body['time_slots'].index('7:30-8:30')] == [[ids['subject_id'], ids['teacher_id']]]
+    assert sum(len(cell) for day in grid for cell in day) == 2
+
+
+def test_teacher_grid_keeps_the_lesson_of_a_dangling_section(client):
+    ids = _add_timetable(client)
+
+    response = client.get(f"/schedules/grid/teacher/{ids['teacher_id']}")
+    assert response.status_code == 200
+    body = response.get_json()
+
+    grid = body['grids'][str(ids['teacher_id'])]
+    tuesday = body['days'].index('Tuesday')
+    # The teacher still teaches it; the unknown section is reported as None
+    assert grid[tuesday][body['time_slots'].index('7:30-8:30')] == [[ids['subject_id'], None]]
+    assert list(body['sections']) == [str(ids['section_id'])]
+
+
+def test_unknown_grid_view_is_404(client):
+    assert client.get('/schedules/grid/subject').status_code == 404
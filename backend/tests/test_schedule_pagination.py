@@ -0,0 +1,110 @@
+import pytest
+from models import db, Teacher, Section, Subject, Schedule, DataVersion
+from routes.schedules import SCHEDULE_PAGE_SIZE_MAX
+
+
+@pytest.fixture
+def timetable(app):
+    """Two sections taught by two teachers over two days and two slots
+
+    Every combination appears once, so each filter value matches half of
+    the 16 rows. Returns the ids keyed by name.
+    """
+    subjects = [Subject(name='Mathematics', code='MATH'), Subject(name='Science', code='SCI')]
+    sections = [Section(name='Grade 7 - Sunflower'), Section(name='Grade 7 - Rose')]
+    db.session.add_all(subjects + sections)
+    db.session.flush()
+    teachers = [Teacher(name='Michael Tan', subject_id=subjects[0].id),
+                Teacher(name='Ana Cruz', subject_id=subjects[1].id)]
+    db.session.add_all(teachers)
+    db.session.flush()
+
+    for day in ('Monday', 'Tuesday'):
+        for time_slot in ('7:30-8:30', '8:30-9:30'):
+            for section in sections:
+                for teacher, subject in zip(teachers, subjects):
+                    db.session.add(Schedule(day=day, time_slot=time_slot, teacher_id=teacher.id,
+                                            section_id=section.id, subject_id=subject.id))
+    DataVersion.bump(db.session)
+    db.session.commit()
+    ids = {'teacher_id': teachers[1].id, 'section_id': sections[1].id, 'subject_id': subjects[1].id}
+    db.session.expunge_all()
+    return ids
+
+
+def _all_pages(client, query):
+    """Follow next_cursor from the first page; return the ids of every page"""
+    pages = []
+    url = f'/schedules/?{query}'
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        body = response.get_json()
+        pages.append([item['id'] for item in body['items']])
+        url = f"/schedules/?{query}&cursor={body['next_cursor']}" if body['next_cursor'] else None
+    return pages
+
+
+def test_cursor_continues_where_the_previous_page_ended(client, timetable):
+    pages = _all_pages(client, 'limit=5')
+
+    assert [len(page) for page in pages] == [5, 5, 5, 1]
+    ids = [schedule_id for page in pages for schedule_id in page]
+    assert ids == sorted(ids)
+    assert ids == [schedule.id for schedule in Schedule.query.order_by(Schedule.id)]
+
+
+def test_last_full_page_has_no_cursor(client, timetable):
+    body = client.get('/schedules/?limit=16').get_json()
+
+    assert len(body['items']) == 16
+    assert body['next_cursor'] is None
+
+
+@pytest.mark.parametrize('param, value', [
+    ('day', 'Tuesday'),
+    ('time_slot', '8:30-9:30'),
+    ('teacher_id', None),
+    ('section_id', None),
+    ('subject_id', None),
+])
+def test_each_filter_pages_through_its_rows_only(client, timetable, param, value):
+    value = timetable[param] if value is None else value
+    pages = _all_pages(client, f'{param}={value}&limit=3')
+
+    ids = [schedule_id for page in pages for schedule_id in page]
+    expected = Schedule.query.filter(getattr(Schedule, param) == value).order_by(Schedule.id)
+    assert ids == [schedule.id for schedule in expected]
+    assert len(ids) == 8
+
+
+def test_filters_combine(client, timetable):
+    body = client.get(f"/schedules/?day=Monday&section_id={timetable['section_id']}").get_json()
+
+    assert len(body['items']) == 4
+    assert {item['day'] for item in body['items']} == {'Monday'}
+    assert {item['section']['id'] for item in body['items']} == {timetable['section_id']}
+
+
+@pytest.mark.parametrize('limit', ['1', str(SCHEDULE_PAGE_SIZE_MAX)])
+def test_limit_bounds_are_accepted(client, timetable, limit):
+    response = client.get(f'/schedules/?limit={limit}')
+
+    assert response.status_code == 200
+    assert len(response.get_json()['items']) == min(int(limit), 16)
+
+
+@pytest.mark.parametrize('query', [
+    'limit=0',
+    f'limit={SCHEDULE_PAGE_SIZE_MAX + 1}',
+    'limit=-1',
+    'limit=ten',
+    'cursor=abc',
+    'cursor=-1',
+    'teacher_id=x',
+])
+def test_bad_parameters_are_rejected(client, timetable, query):
+    response = client.get(f'/schedules/?{query}')
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
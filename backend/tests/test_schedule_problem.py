@@ -0,0 +1,63 @@
+import random
+import pytest
+from benchmarks.instances import generate_instance
+from scripts.schedule_problem import ScheduleProblem, OccupancyIndex
+
+# Small and crowded instances: teacher ratios below 1 force conflicts
+INSTANCES = [(5, 0.8), (20, 1.0), (50, 0.8)]
+
+
+def _problem(num_sections, teacher_ratio):
+    return ScheduleProblem.from_dict(generate_instance(num_sections, teacher_ratio, seed=num_sections))
+
+
+def _assert_same_metrics(actual, expected):
+    assert actual['teacher_conflicts'] == expected['teacher_conflicts']
+    assert actual['section_conflicts'] == expected['section_conflicts']
+    assert actual['suitability'] == expected['suitability']
+    assert actual['load_variance'] == pytest.approx(expected['load_variance'])
+
+
+def _random_move(problem, solution, rng):
+    """A random single-gene move: a new slot, a new teacher, or both"""
+    gene = rng.randrange(problem.num_genes)
+    slot, teacher = solution.slots[gene], solution.teachers[gene]
+    kind = rng.choice(['slot', 'teacher', 'both'])
+    if kind != 'teacher':
+        slot = problem.random_slot_change(slot, rng)
+    if kind != 'slot':
+        teacher = rng.randrange(problem.num_teachers)
+    return gene, slot, teacher
+
+
+@pytest.mark.parametrize('num_sections, teacher_ratio', INSTANCES)
+def test_evaluate_population_matches_evaluate(num_sections, teacher_ratio):
+    problem = _problem(num_sections, teacher_ratio)
+    rng = random.Random(0)
+    population = [problem.random_solution(rng) for _ in range(30)]
+
+    for actual, solution in zip(problem.evaluate_population(population), population):
+        _assert_same_metrics(actual, problem.evaluate(solution))
+
+
+@pytest.mark.parametrize('num_sections, teacher_ratio', INSTANCES)
+def test_occupancy_index_matches_evaluate(num_sections, teacher_ratio):
+    problem = _problem(num_sections, teacher_ratio)
+    rng = random.Random(1)
+    index = OccupancyIndex(problem, problem.random_solution(rng))
+    _assert_same_metrics(index.metrics(), problem.evaluate(index.solution))
+
+    for _ in range(500):
+        gene, slot, teacher = _random_move(problem, index.solution, rng)
+
+        # The move's predicted counts must equal a full evaluation after the move
+        predicted = dict(zip(('teacher_conflicts', 'section_conflicts', 'load_variance', 'suitability'),
+                             index.move_counts(gene, slot, teacher)))
+        moved = index.solution.copy()
+        moved.slots[gene], moved.teachers[gene] = slot, teacher
+        _assert_same_metrics(predicted, problem.evaluate(moved))
+
+        # Accepting about half of the moves keeps the index drifting from the start
+        if rng.random() < 0.5:
+            index.assign(gene, slot, teacher)
+            _assert_same_metrics(index.metrics(), problem.evaluate(index.solution))
@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy import event
+from models import db
+
+LISTING_ROUTES = ['/schedules/', '/schedules/teacher/{teacher_id}', '/schedules/section/{section_id}']
+
+
+def _get_counting_queries(client, url):
+    """GET url and return (statements sent to the database, rows in the response)"""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+    assert response.status_code == 200
+
+    body = response.get_json()
+    rows = body['items'] if isinstance(body, dict) else body
+    return len(statements), len(rows)
+
+
+@pytest.mark.parametrize('route', LISTING_ROUTES)
+def test_listing_query_count_does_not_grow_with_rows(client, add_schedules, route):
+    teacher_id, section_id = add_schedules(1)
+    url = route.format(teacher_id=teacher_id, section_id=section_id)
+    one_row_queries, rows = _get_counting_queries(client, url)
+    assert rows == 1
+
+    add_schedules(49)
+    many_rows_queries, rows = _get_counting_queries(client, url)
+    assert rows == 50
+
+    assert many_rows_queries == one_row_queries
@@ -133,7 +133,7 @@ const ApiDocumentation: React.FC = () => {
                 <ApiEndpoint
                   method="GET"
                   path="/schedules/"
-                  description="Get all schedules with related data including teacher, section, and subject information."
+                  description="Get schedules with related teacher, section, and subject information, one page at a time. Filter with day, time_slot, teacher_id, section_id and subject_id; page with limit (default 500) and the cursor returned as next_cursor."
                   expanded
                 />
                 <ApiEndpoint
@@ -146,6 +146,11 @@ const ApiDocumentation: React.FC = () => {
                   path="/schedules/section/:section_id"
                   description="Get schedule for a specific section with related teacher and subject information."
                 />
+                <ApiEndpoint
+                  method="GET"
+                  path="/schedules/grid/:view"
+                  description="Get day × time slot timetable grids for every section or teacher (view is section or teacher; append /:id for one), with name lookup tables."
+                />
                 <ApiEndpoint
                   method="POST"
                   path="/schedules/"
@@ -15,6 +15,7 @@ export default function AlgorithmSelector() {
   const [isLoading, setIsLoading] = useState(false)
   const setAlgorithm = useScheduleStore(state => state.setAlgorithm)
   const generateSchedules = useScheduleStore(state => state.generateSchedules)
+  const generationProgress = useScheduleStore(state => state.generationProgress)
   const navigate = useNavigate()
   const theme = useTheme()
 
@@ -104,7 +105,9 @@ export default function AlgorithmSelector() {
               {isLoading ? (
                 <>
                   <Loader2 className="h-4 w-4 animate-spin" /> 
-                  Processing...
+                  {generationProgress
+                    ? `Step ${generationProgress.step} · ${generationProgress.teacher_conflicts + generationProgress.section_conflicts} conflicts · ${generationProgress.elapsed_seconds.toFixed(1)}s`
+                    : 'Processing...'}
                 </>
               ) : (
                 <>
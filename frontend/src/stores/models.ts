@@ -19,8 +19,63 @@ interface Metrics {
   suitability: number;
   possible_conflicts: number;
   execution_time: number;
+  // Seconds per phase: load, init, search, evaluate, persist, commit
+  phases?: Record<string, number>;
+  // Run counters such as evaluations, generations/iterations and moves_accepted
+  counters?: Record<string, number>;
 }
 
+// Response of a queued generation request
+interface GenerationJobResponse {
+  status: string;
+  message: string;
+  job_id: string;
+  status_url: string;
+}
+
+// Latest solver snapshot streamed while a job runs
+export interface GenerationProgress {
+  algorithm: string;
+  step: number;
+  best_score: number;
+  teacher_conflicts: number;
+  section_conflicts: number;
+  elapsed_seconds: number;
+}
+
+// Status of a generation job while it runs
+interface GenerationJobStatus {
+  job_id: string;
+  algorithm: string;
+  status: 'queued' | 'running' | 'completed' | 'failed';
+  message?: string;
+  data?: GenerationResult['data'];
+}
+
+const API_BASE_URL = 'http://127.0.0.1:8080';
+
+// Follow a job's Server-Sent Events stream until it completes or fails
+const waitForJob = (statusUrl: string, onProgress: (progress: GenerationProgress) => void) =>
+  new Promise<GenerationJobStatus>((resolve, reject) => {
+    const source = new EventSource(`${API_BASE_URL}${statusUrl}/events`, { withCredentials: true });
+    
+    source.addEventListener('progress', (event) => {
+      onProgress(JSON.parse((event as MessageEvent).data));
+    });
+    
+    const finish = (event: Event) => {
+      source.close();
+      resolve(JSON.parse((event as MessageEvent).data));
+    };
+    source.addEventListener('completed', finish);
+    source.addEventListener('failed', finish);
+    
+    source.onerror = () => {
+      source.close();
+      reject(new Error('Lost connection to the generation job'));
+    };
+  });
+
 // Define the API response type
 interface GenerationResult {
   message: string;
@@ -39,6 +94,7 @@ interface ScheduleStore {
   selectedAlgorithm: Algorithm;
   isGenerating: boolean;
   generationResult: GenerationResult | null;
+  generationProgress: GenerationProgress | null;
   error: string | null;
   setAlgorithm: (algorithm: Algorithm) => void;
   generateSchedules: () => Promise<void>;
@@ -49,6 +105,7 @@ export const useScheduleStore = create<ScheduleStore>((set, get) => ({
   selectedAlgorithm: 'Ant Colony',
   isGenerating: false,
   generationResult: null,
+  generationProgress: null,
   error: null,
   
   setAlgorithm: (algorithm) => set({ selectedAlgorithm: algorithm }),
@@ -58,9 +115,10 @@ export const useScheduleStore = create<ScheduleStore>((set, get) => ({
     const endpoint = algorithmToEndpoint[selectedAlgorithm];
     
     try {
-      set({ isGenerating: true, error: null });
+      set({ isGenerating: true, generationProgress: null, error: null });
       
-      const response = await axios.post<GenerationResult>(`http://127.0.0.1:8080/schedules${endpoint}`, {
+      // The generate endpoints queue a job and return its id right away
+      const response = await axios.post<GenerationJobResponse>(`${API_BASE_URL}/schedules${endpoint}`, {
         clear_existing: true
       }, {
         headers: {
@@ -69,9 +127,24 @@ export const useScheduleStore = create<ScheduleStore>((set, get) => ({
         withCredentials: true
       });
       
+      // Stream solver progress until the job has finished
+      const job = await waitForJob(response.data.status_url, (progress) => {
+        set({ generationProgress: progress });
+      });
+      
+      if (job.status === 'failed') {
+        throw new Error(job.message || 'Schedule generation failed');
+      }
+      
       set({ 
         isGenerating: false, 
-        generationResult: response.data 
+        generationResult: {
+          status: 'success',
+          success: true,
+          message: job.message || '',
+          metrics: job.data!.metrics,
+          data: job.data
+        }
       });
       
       // Remove the return statement to match Promise<void> return type
@@ -54,6 +54,21 @@ export interface Section {
   name: string;
 }
 
+// Filters accepted by GET /schedules/
+export interface ScheduleFilters {
+  day?: string;
+  time_slot?: string;
+  teacher_id?: number;
+  section_id?: number;
+  subject_id?: number;
+}
+
+// One keyset page of GET /schedules/
+export interface SchedulePage {
+  items: ScheduleItem[];
+  next_cursor: string | null;
+}
+
 export interface ScheduleData {
   [timeSlot: string]: {
     [day: string]: string[];  // Change to array of strings instead of a single string
@@ -68,7 +83,8 @@ interface ResultsState {
   formattedSchedule: ScheduleData;
   loading: boolean;
   error: string | null;
-  fetchSchedules: () => Promise<ScheduleItem[]>;  // Updated return type
+  fetchSchedulePage: (filters?: ScheduleFilters, cursor?: string | null) => Promise<SchedulePage>;
+  fetchSchedules: (filters?: ScheduleFilters) => Promise<ScheduleItem[]>;  // Updated return type
   fetchTeachers: () => Promise<Teacher[]>;        // Updated return type
   fetchSubjects: () => Promise<Subject[]>;        // Updated return type
   fetchSections: () => Promise<Section[]>;        // Updated return type
@@ -124,10 +140,24 @@ export const useResultsStore = create<ResultsState>((set, get) => ({
     }
   },
   
-  fetchSchedules: async () => {
+  fetchSchedulePage: async (filters = {}, cursor = null) => {
+    const response = await axios.get<SchedulePage>(`${API_BASE_URL}/schedules/`, {
+      params: { ...filters, ...(cursor ? { cursor } : {}) }
+    });
+    return response.data;
+  },
+  
+  fetchSchedules: async (filters = {}) => {
     try {
-      const response = await axios.get(`${API_BASE_URL}/schedules`);
-      const data: ScheduleItem[] = response.data;
+      // Follow the keyset cursor until the last page
+      const data: ScheduleItem[] = [];
+      let cursor: string | null = null;
+      do {
+        const page: SchedulePage = await get().fetchSchedulePage(filters, cursor);
+        data.push(...page.items);
+        cursor = page.next_cursor;
+      } while (cursor);
+      
       set({ scheduleItems: data });
       return data;
     } catch (error) {